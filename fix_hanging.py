@@ -7,22 +7,28 @@
 Fix hanging issues with exchange connections
 """
 import sys
-import time
 import signal
 from pathlib import Path
 
 # Add path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+class TestTimeout(BaseException):
+    """Raised in the main thread when the test exceeds its time limit
+    (BaseException so the test's own ``except Exception`` can't swallow it)"""
+
 def force_cleanup():
-    """Force cleanup of threads and connections"""
-    import gc
+    """Report threads left behind and close any exchange connections still open"""
     import threading
     
-    print("🧹 Forcing cleanup of threads and connections...")
+    print("🧹 Closing exchange connections...")
+    try:
+        from utils.data_handler import close_shared_exchanges
+        close_shared_exchanges()
+    except Exception as e:
+        print(f"⚠️  Could not close exchange connections: {e}")
     
-    # Collect garbage
-    gc.collect()
+    print("🧹 Checking for leftover threads...")
     
     # List active threads
     active_threads = threading.active_count()
@@ -33,13 +39,6 @@ def force_cleanup():
         for thread in threading.enumerate():
             if thread != threading.current_thread():
                 print(f"   Thread: {thread.name} (daemon: {thread.daemon})")
-    
-    # Force exit if needed
-    time.sleep(2)
-    if threading.active_count() > 1:
-        print("🔨 Force terminating remaining threads...")
-        import os
-        os._exit(0)
 
 def setup_signal_handler():
     """Setup signal handler for clean exit"""
@@ -51,11 +50,8 @@ def setup_signal_handler():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-def test_with_timeout():
+def test_with_timeout(timeout: int = 60):
     """Test BTC generation with timeout"""
-    import threading
-    import time
-    
     setup_signal_handler()
     
     print("🧪 Testing BTC Generation with Timeout")
@@ -81,24 +77,23 @@ def test_with_timeout():
             
         except Exception as e:
             print(f"❌ Test failed: {e}")
-        finally:
-            print("🧹 Cleaning up...")
-            force_cleanup()
-    
-    # Run test in a separate thread with timeout
-    test_thread = threading.Thread(target=run_test, daemon=True)
-    test_thread.start()
     
-    # Wait for completion with timeout
-    test_thread.join(timeout=60)  # 60 second timeout
+    def on_timeout(signum, frame):
+        raise TestTimeout()
     
-    if test_thread.is_alive():
-        print("⏰ Test timed out after 60 seconds")
-        print("🔨 Forcing cleanup...")
-        force_cleanup()
-    else:
+    # Run the test in the main thread; SIGALRM interrupts it at the timeout so
+    # finally blocks still run and force_cleanup() can close the exchange
+    # connections, instead of abandoning a daemon thread and killing the
+    # process with os._exit
+    signal.signal(signal.SIGALRM, on_timeout)
+    signal.alarm(timeout)
+    try:
+        run_test()
         print("✅ Test completed within timeout")
-        time.sleep(2)  # Give time for cleanup
+    except TestTimeout:
+        print(f"⏰ Test timed out after {timeout} seconds")
+    finally:
+        signal.alarm(0)
         force_cleanup()
 
 if __name__ == "__main__":
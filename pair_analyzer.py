@@ -11,15 +11,16 @@ import argparse
 import logging
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, TYPE_CHECKING
 
 # Add the project root to Python path for imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-# Import the WORKING analyzer from data_handler
-from utils.data_handler import VersionedAnalyzer
-from utils.pairlist_handler import PairlistHandler
+# The utils modules pull in freqtrade, pandas and numba; they are imported in
+# main() once the arguments are parsed, so --help and usage errors stay fast
+if TYPE_CHECKING:
+    from utils.pairlist_handler import PairlistHandler
 
 # Configure logging
 log_format = '%(asctime)s - %(levelname)s - %(message)s'
@@ -107,6 +108,21 @@ Examples:
         help='Number of days of data to analyze (default: 90)'
     )
     
+    parser.add_argument(
+        '--analysis-timeout',
+        type=float,
+        default=None,
+        help='Time budget in seconds for loading and analyzing pairs, after the batch download of missing data; unfinished pairs count as failed (default: no limit)'
+    )
+    
+    parser.add_argument(
+        '--min-volume',
+        type=float,
+        default=0.0,
+        dest='min_volume',
+        help='Skip pairs whose mean candle volume is below this (default: 0, no filter)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v', 
         action='store_true',
@@ -160,7 +176,7 @@ Examples:
     
     return parser.parse_args()
 
-def list_available_configs(pairlist_handler: PairlistHandler, quote_currency: str):
+def list_available_configs(pairlist_handler: 'PairlistHandler', quote_currency: str):
     """List all available configurations with pair counts"""
     print("\n" + "="*60)
     print("AVAILABLE PAIRLIST CONFIGURATIONS")
@@ -184,7 +200,7 @@ def list_available_configs(pairlist_handler: PairlistHandler, quote_currency: st
     print(f"    python pair_analyzer.py --quote {quote_currency} --config {list(configs.keys())[0]}")
     print(f"    python pair_analyzer.py --quote {quote_currency} --use-configs")
 
-def analyze_pairlist_overlap(pairlist_handler: PairlistHandler, quote_currency: str):
+def analyze_pairlist_overlap(pairlist_handler: 'PairlistHandler', quote_currency: str):
     """Analyze and display pairlist overlap between configs"""
     print("\n" + "="*60)
     print("PAIRLIST OVERLAP ANALYSIS")
@@ -222,7 +238,8 @@ def analyze_pairlist_overlap(pairlist_handler: PairlistHandler, quote_currency:
         else:
             print(f"  {config_name}: No unique pairs")
 
-def print_results_summary(results: List[Dict], failed_pairs: List[str], args, pair_source: str):
+def print_results_summary(results: List[Dict], failed_pairs: List[str], args, pair_source: str,
+                          least_volatile: List[Dict]):
     """Print a comprehensive results summary with pair source info"""
     print("\n" + "="*80)
     print("FREQTRADE PAIR ANALYZER - RESULTS SUMMARY")
@@ -254,9 +271,8 @@ def print_results_summary(results: List[Dict], failed_pairs: List[str], args, pa
                   f"Volume: {volume:.1f}")
         
         # Show least volatile pairs if requested
-        if args.least_pairs > 0 and len(results) > args.least_pairs:
+        if least_volatile:
             print(f"\nLeast Volatile {args.least_pairs} Pairs:")
-            least_volatile = sorted(results, key=lambda x: x.get('volatility', 0))[:args.least_pairs]
             for i, result in enumerate(least_volatile, 1):
                 score = result.get('composite_score', 0)
                 volatility = result.get('volatility', 0)
@@ -280,6 +296,11 @@ def main():
     try:
         args = parse_args()
         
+        # Import the WORKING analyzer from data_handler
+        from utils.data_handler import VersionedAnalyzer
+        from utils.analysis_engine import k_smallest_indices
+        from utils.pairlist_handler import PairlistHandler
+        
         # Set logging level based on verbose flag
         if args.verbose:
             logging.getLogger().setLevel(logging.DEBUG)
@@ -332,24 +353,26 @@ def main():
         logger.info("Initializing analyzer...")
         analyzer = VersionedAnalyzer(
             quote_currency=args.quote,
-            max_workers=args.workers
+            max_workers=args.workers,
+            override_pairs=pairs_to_analyze,
+            analysis_timeout=args.analysis_timeout,
+            min_mean_volume=args.min_volume
         )
         
         # Update analyzer parameters
         analyzer.timeframe = args.timeframe
         analyzer.days_to_analyze = args.days
         
-        # Override the pair selection if we have specific pairs
+        # The analyzer skips its own pair selection when given specific pairs
         if pairs_to_analyze:
-            # Monkey patch the _get_valid_pairs method to return our pairs
-            original_get_valid_pairs = analyzer._get_valid_pairs
-            analyzer._get_valid_pairs = lambda: pairs_to_analyze
             logger.info(f"Overriding pair selection with {len(pairs_to_analyze)} pairs from {pair_source}")
         
         logger.info(f"Starting analysis for {args.quote} pairs with timeframe {args.timeframe}...")
         
-        # Run the analysis
-        results, failed_pairs = analyzer.run_analysis()
+        # Run the analysis; the exchange connection is closed on leaving the
+        # block, since no other analyzer uses it
+        with analyzer:
+            results, failed_pairs = analyzer.run_analysis()
         
         # Save results
         if results or failed_pairs:
@@ -369,8 +392,12 @@ def main():
                 if pairlist_handler.export_pairlist(export_pairs, export_path, "json"):
                     logger.info(f"Exported {len(export_pairs)} pairs to {export_path}")
             
-            # Display summary
-            print_results_summary(results, failed_pairs, args, pair_source)
+            # Display summary, with the least volatile pairs if requested
+            least_volatile = []
+            if args.least_pairs > 0 and len(results) > args.least_pairs:
+                volatilities = [result.get('volatility', 0) for result in results]
+                least_volatile = [results[i] for i in k_smallest_indices(volatilities, args.least_pairs)]
+            print_results_summary(results, failed_pairs, args, pair_source, least_volatile)
             
             logger.info("Analysis completed successfully!")
             return 0
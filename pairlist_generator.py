@@ -10,23 +10,41 @@ Version: 1.0.0
 Generates pairlists compatible with your format and includes advanced filtering
 """
 import argparse
+import functools
 import json
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime, timezone
 import logging
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    # Fallback to the standard library parser if orjson is not installed
+    orjson = None
 
 # Add path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from utils.data_handler import VersionedAnalyzer
+from utils.analysis_engine import k_smallest_indices
 from utils.pairlist_handler import PairlistHandler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=4)
+def _load_analysis_file(path_str: str, mtime_ns: int) -> Dict:
+    """Parse an analysis results file; keyed on mtime so a rewritten file is read again"""
+    if orjson is not None:
+        with open(path_str, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path_str) as f:
+        return json.load(f)
+
 class PairlistGenerator:
     """Advanced pairlist generator with multiple filtering strategies"""
     
@@ -34,14 +52,19 @@ class PairlistGenerator:
         self.quote_currency = quote_currency.upper()
         self.user_data_dir = Path(user_data_dir) if user_data_dir else Path("/home/facepipe/freqtrade/user_data")
         
-        # Create timestamped output directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.output_dir = Path("generated_pairlists") / f"batch_{timestamp}"
+        # Create timestamped output directory; files of the batch share its timestamp
+        self.run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.output_dir = Path("generated_pairlists") / f"batch_{self.run_timestamp}"
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Initialize handlers
         self.pairlist_handler = PairlistHandler(self.user_data_dir)
         
+        # Markets and tickers fetched once and shared by all generators
+        self._exchange_snapshot = None
+        # Quote pairs with volume and price built from the snapshot, highest volume first
+        self._pairs_table = None
+        
         # Abbreviation mapping for filenames
         self.abbreviations = {
             'high_volume': 'HV',
@@ -82,18 +105,14 @@ class PairlistGenerator:
         
     def get_abbreviated_filename(self, filter_types: List[str], quote: str) -> str:
         """Generate abbreviated filename based on active filters"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Get abbreviations for active filters
-        abbrevs = []
-        for filter_type in filter_types:
-            abbrev = self.abbreviations.get(filter_type, filter_type.upper()[:3])
-            if abbrev not in abbrevs:
-                abbrevs.append(abbrev)
+        # Get abbreviations for active filters, without repeats and in order
+        abbrevs = dict.fromkeys(
+            self.abbreviations.get(filter_type, filter_type.upper()[:3]) for filter_type in filter_types
+        )
         
         # Create filename
         filter_part = "_".join(abbrevs)
-        filename = f"pairs{filter_part}_{quote}_{timestamp}.json"
+        filename = f"pairs{filter_part}_{quote}_{self.run_timestamp}.json"
         
         return filename
         
@@ -115,21 +134,65 @@ class PairlistGenerator:
             "blacklist_count": len(blacklist)
         }
     
-    def get_exchange_pairs_with_volume(self, min_volume_24h: float = 100) -> List[Dict[str, any]]:
-        """Get pairs from exchange with volume data"""
-        analyzer = None
-        try:
-            # Initialize analyzer to get exchange connection
-            analyzer = VersionedAnalyzer(quote_currency=self.quote_currency, max_workers=1)
-            markets = analyzer.exchange.get_markets()
-            
-            # Get tickers for volume data
-            logger.info("Fetching market data with volume information...")
-            tickers = analyzer.exchange.get_tickers()
+    def _get_exchange_snapshot(self) -> Tuple[Dict[str, Dict], Optional[Dict[str, Dict]]]:
+        """
+        Fetch markets and all tickers in one exchange session and cache them,
+        so each generator doesn't reconnect and refetch
+        
+        Returns:
+            (markets, tickers); tickers is None if they could not be fetched
+        """
+        if self._exchange_snapshot is None:
+            with VersionedAnalyzer(quote_currency=self.quote_currency, max_workers=1) as analyzer:
+                markets = analyzer.markets
+                try:
+                    # A single request returns the tickers of every pair
+                    logger.info("Fetching market data with volume information...")
+                    tickers = analyzer.exchange.get_tickers()
+                except Exception as e:
+                    logger.warning(f"Could not fetch tickers: {e}")
+                    tickers = None
+            self._exchange_snapshot = (markets, tickers)
+        return self._exchange_snapshot
+
+    def _get_pairs_table(self) -> List[Dict[str, any]]:
+        """
+        All active spot pairs of the quote currency with their 24h volume and
+        price, sorted by volume (highest first); built once and filtered by
+        each generator
+        """
+        if self._pairs_table is None:
+            markets, tickers = self._get_exchange_snapshot()
+            if tickers is None:
+                raise ConnectionError("No ticker data available")
             
-            pairs_with_data = []
+            pairs_table = []
             quote_suffix = f"/{self.quote_currency}"
             
+            for pair, market_info in markets.items():
+                if (pair.endswith(quote_suffix) and 
+                    market_info.get('active', False) and
+                    market_info.get('spot', True) and
+                    not market_info.get('margin', False) and
+                    not market_info.get('future', False)):
+                    
+                    ticker = tickers.get(pair, {})
+                    pairs_table.append({
+                        'pair': pair,
+                        'volume_24h': ticker.get('quoteVolume', 0) or 0,
+                        'price': ticker.get('last', 0) or 0,
+                        'market_info': market_info
+                    })
+            
+            pairs_table.sort(key=lambda x: x['volume_24h'], reverse=True)
+            self._pairs_table = pairs_table
+        return self._pairs_table
+
+    def get_exchange_pairs_with_volume(self, min_volume_24h: float = 100) -> List[Dict[str, any]]:
+        """Get pairs from exchange with volume data (highest volume first)"""
+        try:
+            pairs_table = self._get_pairs_table()
+            
             # Adjust minimum volume based on quote currency
             # BTC pairs typically have much lower volume than USDT pairs
             if self.quote_currency == 'BTC':
@@ -139,24 +202,7 @@ class PairlistGenerator:
             
             logger.info(f"Using adjusted minimum volume: {adjusted_min_volume} {self.quote_currency}")
             
-            for pair, market_info in markets.items():
-                if (pair.endswith(quote_suffix) and 
-                    market_info.get('active', False) and
-                    market_info.get('spot', True) and
-                    not market_info.get('margin', False) and
-                    not market_info.get('future', False)):
-                    
-                    ticker = tickers.get(pair, {})
-                    volume_24h = ticker.get('quoteVolume', 0) or 0
-                    price = ticker.get('last', 0) or 0
-                    
-                    if volume_24h >= adjusted_min_volume:
-                        pairs_with_data.append({
-                            'pair': pair,
-                            'volume_24h': volume_24h,
-                            'price': price,
-                            'market_info': market_info
-                        })
+            pairs_with_data = [p for p in pairs_table if p['volume_24h'] >= adjusted_min_volume]
             
             logger.info(f"Found {len(pairs_with_data)} pairs with sufficient volume (min: {adjusted_min_volume})")
             return pairs_with_data
@@ -164,18 +210,6 @@ class PairlistGenerator:
         except Exception as e:
             logger.error(f"Error fetching exchange data: {e}")
             return []
-        finally:
-            # Clean up the analyzer and exchange connection
-            if analyzer and hasattr(analyzer, 'exchange'):
-                try:
-                    if hasattr(analyzer.exchange, 'close'):
-                        analyzer.exchange.close()
-                    # Also clean up any background threads
-                    import gc
-                    gc.collect()
-                except Exception as e:
-                    logger.debug(f"Error during cleanup: {e}")
-            del analyzer
     
     def generate_high_volume_pairlist(self, min_volume: float = 1000, max_pairs: int = 200) -> Dict:
         """Generate high volume pairlist"""
@@ -187,11 +221,9 @@ class PairlistGenerator:
             
         logger.info(f"Generating high volume pairlist (min: {adjusted_min_volume} {self.quote_currency})")
         
+        # Already sorted by volume (highest first)
         pairs_data = self.get_exchange_pairs_with_volume(adjusted_min_volume)
         
-        # Sort by volume (highest first)
-        pairs_data.sort(key=lambda x: x['volume_24h'], reverse=True)
-        
         # Take top N pairs
         top_pairs = pairs_data[:max_pairs]
         pairs = [p['pair'] for p in top_pairs]
@@ -288,10 +320,7 @@ class PairlistGenerator:
             
             filtered_pairs.append(pair_data)
         
-        # Sort by volume for quality
-        filtered_pairs.sort(key=lambda x: x['volume_24h'], reverse=True)
-        
-        # Take top pairs
+        # Take top pairs (still in volume order)
         selected_pairs = filtered_pairs[:max_pairs]
         pairs = [p['pair'] for p in selected_pairs]
         
@@ -317,6 +346,24 @@ class PairlistGenerator:
         
         return config
     
+    @staticmethod
+    def _latest_analysis_file() -> Optional[Path]:
+        """Newest analyzer results file across outputs/ and user_data/analysis_results/"""
+        analysis_files = [
+            path
+            for results_dir in (Path("outputs"), Path("user_data/analysis_results"))
+            for path in results_dir.glob("pair_analysis_*.json")
+        ]
+        return max(analysis_files, key=lambda x: x.stat().st_mtime, default=None)
+    
+    @staticmethod
+    def _load_analysis(analysis_file: Path) -> Dict:
+        """
+        Load an analysis results file, parsed once while it is unchanged; the
+        data is shared between generators and must not be modified
+        """
+        return _load_analysis_file(str(analysis_file), analysis_file.stat().st_mtime_ns)
+    
     def generate_analysis_based_pairlist(self, analysis_file: Path = None, 
                                        top_n: int = 50, min_score: float = 0.3) -> Dict:
         """Generate pairlist based on analyzer results"""
@@ -324,31 +371,28 @@ class PairlistGenerator:
         
         # Find latest analysis file if not specified
         if not analysis_file:
-            analysis_files = list(Path("outputs").glob("pair_analysis_*.json"))
-            if not analysis_files:
-                analysis_files = list(Path("user_data/analysis_results").glob("pair_analysis_*.json"))
+            analysis_file = self._latest_analysis_file()
             
-            if not analysis_files:
+            if not analysis_file:
                 logger.error("No analysis files found. Run analyzer first.")
                 return {}
             
-            analysis_file = max(analysis_files, key=lambda x: x.stat().st_mtime)
             logger.info(f"Using analysis file: {analysis_file}")
         
         try:
-            with open(analysis_file) as f:
-                analysis_data = json.load(f)
+            analysis_data = self._load_analysis(Path(analysis_file))
         except Exception as e:
             logger.error(f"Error loading analysis file: {e}")
             return {}
         
         results = analysis_data.get('results', [])
         
-        # Filter by minimum score and take top N
+        # Filter by minimum score and take top N; only the selected pairs are
+        # sorted, in the order a stable descending sort would give
         good_pairs = [r for r in results if r.get('composite_score', 0) >= min_score]
-        good_pairs.sort(key=lambda x: x.get('composite_score', 0), reverse=True)
+        scores = np.array([r.get('composite_score', 0) for r in good_pairs], dtype=np.float64)
         
-        top_pairs = good_pairs[:top_n]
+        top_pairs = [good_pairs[i] for i in k_smallest_indices(-scores, top_n)]
         pairs = [p['pair'] for p in top_pairs]
         
         config = self.create_base_config_template(
@@ -404,13 +448,14 @@ class PairlistGenerator:
         
         diversified_pairs = []
         used_pairs = set()
+        pairs_index = {p['pair']: p for p in pairs_data}
         
         # Select pairs from each sector
         for sector, tokens in sectors.items():
             sector_pairs = []
             for token in tokens:
                 pair = f"{token}/{self.quote_currency}"
-                pair_data = next((p for p in pairs_data if p['pair'] == pair), None)
+                pair_data = pairs_index.get(pair)
                 if pair_data and pair not in used_pairs:
                     sector_pairs.append(pair_data)
                     used_pairs.add(pair)
@@ -442,7 +487,8 @@ class PairlistGenerator:
         
         config['sector_breakdown'] = {}
         for sector, tokens in sectors.items():
-            sector_pairs_in_list = [p for p in pairs if any(p.startswith(token + "/") for token in tokens)]
+            sector_tokens = set(tokens)
+            sector_pairs_in_list = [p for p in pairs if p.split('/')[0] in sector_tokens]
             if sector_pairs_in_list:
                 config['sector_breakdown'][sector] = sector_pairs_in_list
         
@@ -506,6 +552,7 @@ class PairlistGenerator:
             
             if analysis_pairs:
                 # Filter to only pairs that passed analysis
+                analysis_pairs = set(analysis_pairs)
                 filtered_pairs = [p for p in filtered_pairs if p['pair'] in analysis_pairs]
                 applied_filters.append('analysis_based')
                 filter_descriptions.append(f"analysis score >= {filters.get('min_score', 0.3)}")
@@ -522,6 +569,7 @@ class PairlistGenerator:
             )
             
             if stable_pairs:
+                stable_pairs = set(stable_pairs)
                 filtered_pairs = [p for p in filtered_pairs if p['pair'] in stable_pairs]
                 applied_filters.append('stable')
                 filter_descriptions.append(f"volatility <= {max_vol}")
@@ -584,28 +632,20 @@ class PairlistGenerator:
                                    days: int, timeframe: str) -> List[str]:
         """Get pairs that meet analysis criteria"""
         try:
-            # Look for analysis files that match timeframe and period
-            analysis_files = []
-            for results_dir in [Path("outputs"), Path("user_data/analysis_results")]:
-                if results_dir.exists():
-                    analysis_files.extend(results_dir.glob("pair_analysis_*.json"))
+            # Use most recent analysis file
+            analysis_file = self._latest_analysis_file()
             
-            if not analysis_files:
+            if not analysis_file:
                 logger.warning("No analysis files found for analysis-based filtering")
                 return candidate_pairs  # Return all if no analysis available
             
-            # Use most recent analysis file
-            analysis_file = max(analysis_files, key=lambda x: x.stat().st_mtime)
-            
-            with open(analysis_file) as f:
-                analysis_data = json.load(f)
-            
-            results = analysis_data.get('results', [])
+            results = self._load_analysis(analysis_file).get('results', [])
             
             # Filter by score and limit to candidate pairs
+            candidates = set(candidate_pairs)
             good_pairs = [
                 r['pair'] for r in results 
-                if r.get('composite_score', 0) >= min_score and r['pair'] in candidate_pairs
+                if r.get('composite_score', 0) >= min_score and r['pair'] in candidates
             ]
             
             return good_pairs
@@ -619,24 +659,17 @@ class PairlistGenerator:
         """Get pairs that meet volatility criteria"""
         try:
             # Similar to analysis filtering but for volatility
-            analysis_files = []
-            for results_dir in [Path("outputs"), Path("user_data/analysis_results")]:
-                if results_dir.exists():
-                    analysis_files.extend(results_dir.glob("pair_analysis_*.json"))
+            analysis_file = self._latest_analysis_file()
             
-            if not analysis_files:
+            if not analysis_file:
                 return candidate_pairs
             
-            analysis_file = max(analysis_files, key=lambda x: x.stat().st_mtime)
-            
-            with open(analysis_file) as f:
-                analysis_data = json.load(f)
-            
-            results = analysis_data.get('results', [])
+            results = self._load_analysis(analysis_file).get('results', [])
             
+            candidates = set(candidate_pairs)
             stable_pairs = [
                 r['pair'] for r in results 
-                if r.get('volatility', 1.0) <= max_volatility and r['pair'] in candidate_pairs
+                if r.get('volatility', 1.0) <= max_volatility and r['pair'] in candidates
             ]
             
             return stable_pairs
@@ -658,23 +691,25 @@ class PairlistGenerator:
             "infrastructure": ["GRT", "LPT", "NKN"]
         }
         
-        diversified_pairs = []
-        used_pairs = set()
+        # A token belongs to the first sector listing it
+        token_sectors = {}
+        for sector, tokens in sectors.items():
+            for token in tokens:
+                token_sectors.setdefault(token, sector)
+        
+        # Group the pairs by the sector of their base token in one pass
+        sector_pairs = {sector: [] for sector in sectors}
+        for pair_data in pairs_data:
+            sector = token_sectors.get(pair_data['pair'].split('/')[0])
+            if sector is not None:
+                sector_pairs[sector].append(pair_data)
         
         # Select top pairs from each sector
-        for sector, tokens in sectors.items():
-            sector_pairs = []
-            for pair_data in pairs_data:
-                if pair_data['pair'] not in used_pairs:
-                    for token in tokens:
-                        if pair_data['pair'].startswith(f"{token}/"):
-                            sector_pairs.append(pair_data)
-                            used_pairs.add(pair_data['pair'])
-                            break
-            
+        diversified_pairs = []
+        for pairs in sector_pairs.values():
             # Sort by volume and take top 3-5 from each sector
-            sector_pairs.sort(key=lambda x: x['volume_24h'], reverse=True)
-            diversified_pairs.extend(sector_pairs[:4])
+            pairs.sort(key=lambda x: x['volume_24h'], reverse=True)
+            diversified_pairs.extend(pairs[:4])
         
         return diversified_pairs
     
@@ -683,23 +718,19 @@ class PairlistGenerator:
         logger.info("Generating stable (low volatility) pairlist")
         
         # Look for recent analysis
-        analysis_files = list(Path("outputs").glob("pair_analysis_*.json"))
-        if not analysis_files:
-            analysis_files = list(Path("user_data/analysis_results").glob("pair_analysis_*.json"))
+        analysis_file = self._latest_analysis_file()
         
-        if analysis_files:
-            analysis_file = max(analysis_files, key=lambda x: x.stat().st_mtime)
+        if analysis_file:
             try:
-                with open(analysis_file) as f:
-                    analysis_data = json.load(f)
+                results = self._load_analysis(analysis_file).get('results', [])
                 
-                results = analysis_data.get('results', [])
+                # Filter by volatility, then take the 100 lowest (lowest first)
+                # without sorting every stable pair
+                volatilities = np.array([r.get('volatility', 1.0) for r in results], dtype=np.float64)
+                stable_idx = np.flatnonzero(volatilities <= max_volatility)
+                top_idx = stable_idx[k_smallest_indices(volatilities[stable_idx], 100)]
                 
-                # Filter by volatility
-                stable_pairs = [r for r in results if r.get('volatility', 1.0) <= max_volatility]
-                stable_pairs.sort(key=lambda x: x.get('volatility', 1.0))  # Lowest volatility first
-                
-                pairs = [p['pair'] for p in stable_pairs[:100]]  # Top 100 stable pairs
+                pairs = [results[i]['pair'] for i in top_idx]  # Top 100 stable pairs
                 
             except Exception as e:
                 logger.warning(f"Could not load analysis data: {e}, using volume-based selection")
@@ -726,7 +757,7 @@ class PairlistGenerator:
     def save_pairlist(self, config: Dict, filename: str = None) -> Path:
         """Save pairlist to file"""
         if not filename:
-            filename = f"pairs{config['config_name'].upper()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            filename = f"pairs{config['config_name'].upper()}_{self.run_timestamp}.json"
         
         if not filename.endswith('.json'):
             filename += '.json'
@@ -751,11 +782,8 @@ class PairlistGenerator:
         """Generate comprehensive pairlist with ALL active exchange pairs - NO volume filtering"""
         logger.info(f"Generating ALL active {self.quote_currency} pairs from exchange (no volume filtering)")
         
-        analyzer = None
         try:
-            # Initialize analyzer to get exchange connection
-            analyzer = VersionedAnalyzer(quote_currency=self.quote_currency, max_workers=1)
-            markets = analyzer.exchange.get_markets()
+            markets = self._get_exchange_snapshot()[0]
             
             # Get ALL active pairs directly from markets - NO volume filtering
             quote_suffix = f"/{self.quote_currency}"
@@ -780,24 +808,11 @@ class PairlistGenerator:
             
             try:
                 logger.info("Getting volume data for sorting (not filtering)...")
-                tickers = analyzer.exchange.get_tickers()
                 
-                for pair in all_active_pairs:
-                    ticker = tickers.get(pair, {})
-                    volume_24h = ticker.get('quoteVolume', 0) or 0
-                    price = ticker.get('last', 0) or 0
-                    
-                    pairs_with_data.append({
-                        'pair': pair,
-                        'volume_24h': volume_24h,
-                        'price': price
-                    })
-                    
-                    if volume_24h > 0:
-                        pairs_with_volume_count += 1
-                
-                # Sort by volume (highest first) but KEEP ALL PAIRS
-                pairs_with_data.sort(key=lambda x: x['volume_24h'], reverse=True)
+                # The shared pairs table holds every active pair, sorted by
+                # volume (highest first), so ALL PAIRS are kept
+                pairs_with_data = self._get_pairs_table()
+                pairs_with_volume_count = sum(1 for p in pairs_with_data if p['volume_24h'] > 0)
                 final_pairs = [p['pair'] for p in pairs_with_data]
                 
                 logger.info(f"Final result: {len(final_pairs)} pairs total, {pairs_with_volume_count} have volume > 0")
@@ -852,17 +867,6 @@ class PairlistGenerator:
         except Exception as e:
             logger.error(f"Error generating all pairs list: {e}")
             return {}
-        finally:
-            # Clean up the analyzer and exchange connection
-            if analyzer and hasattr(analyzer, 'exchange'):
-                try:
-                    if hasattr(analyzer.exchange, 'close'):
-                        analyzer.exchange.close()
-                    import gc
-                    gc.collect()
-                except Exception as e:
-                    logger.debug(f"Error during cleanup: {e}")
-            del analyzer
         """Generate all types of pairlists"""
         logger.info(f"🚀 Generating all pairlist types for {self.quote_currency}")
         
@@ -20,7 +20,6 @@ def test_btc_volume():
     print("🧪 Testing BTC Pair Volume Detection")
     print("=" * 50)
     
-    generator = None
     try:
         generator = PairlistGenerator(quote_currency='BTC')
         
@@ -42,19 +41,12 @@ def test_btc_volume():
     except Exception as e:
         print(f"❌ Error in volume test: {e}")
         return False
-    finally:
-        # Force cleanup
-        if generator:
-            del generator
-        import gc
-        gc.collect()
 
 def test_btc_generation():
     """Test BTC pairlist generation"""
     print("\n🚀 Testing BTC Pairlist Generation")
     print("=" * 50)
     
-    generator = None
     try:
         generator = PairlistGenerator(quote_currency='BTC')
         
@@ -90,12 +82,6 @@ def test_btc_generation():
     except Exception as e:
         print(f"❌ Error in generation test: {e}")
         return False
-    finally:
-        # Force cleanup
-        if generator:
-            del generator
-        import gc
-        gc.collect()
 
 def main():
     """Run BTC pairlist tests"""
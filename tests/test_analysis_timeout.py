@@ -0,0 +1,94 @@
+"""
+Tests for the analysis time budget of VersionedAnalyzer.run_analysis
+"""
+import importlib.util
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+HAS_FREQTRADE = importlib.util.find_spec('freqtrade') is not None
+if HAS_FREQTRADE:
+    from utils.data_handler import VersionedAnalyzer
+
+
+class SlowEngine:
+    """Analysis engine stand-in that takes longer than the time budget"""
+    version = 'test'
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def batch_analyze(self, dataframes):
+        time.sleep(self.delay)
+        return {pair: {'volatility': 1.0} for pair in dataframes}
+
+
+class NoDownloads:
+    """Data manager stand-in with all pair data already present"""
+    def download_missing_pairs(self, pairs, days):
+        return []
+
+
+@unittest.skipUnless(HAS_FREQTRADE, "freqtrade is not installed")
+class AnalysisTimeoutTest(unittest.TestCase):
+    PAIRS = ['AAA/USDT', 'BBB/USDT', 'CCC/USDT', 'DDD/USDT']
+
+    def make_analyzer(self, delay: float, analysis_timeout, load_delay: float = 0.0):
+        """Build an analyzer without loading a config or connecting to an exchange"""
+        analyzer = VersionedAnalyzer.__new__(VersionedAnalyzer)
+        analyzer._version = VersionedAnalyzer.CURRENT_VERSION
+        analyzer.quote_currency = 'USDT'
+        analyzer.max_workers = 2
+        analyzer.override_pairs = list(self.PAIRS)
+        analyzer.days_to_analyze = 90
+        analyzer.extra_days = 7
+        analyzer.analysis_timeout = analysis_timeout
+        analyzer.start_time = time.time()
+        analyzer.data_manager = NoDownloads()
+        analyzer.analysis_engine = SlowEngine(delay)
+        def fetch_pair_data(pair):
+            time.sleep(load_delay)
+            return pd.DataFrame({'close': [1.0, 2.0, 3.0]})
+        analyzer._fetch_pair_data = fetch_pair_data
+        analyzer._result_cache_key = lambda pair, dataframe: None
+        analyzer.RESULT_CACHE_PATH = Path(self.tmpdir.name) / 'analysis_results'
+        return analyzer
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_pairs_over_budget_are_failed(self):
+        analyzer = self.make_analyzer(delay=3.0, analysis_timeout=0.5)
+        start = time.monotonic()
+        results, failed_pairs = analyzer.run_analysis()
+        # Running batches are stopped instead of waited for
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertEqual(results, [])
+        self.assertCountEqual(failed_pairs, self.PAIRS)
+
+    def test_loading_counts_against_budget(self):
+        analyzer = self.make_analyzer(delay=0.0, analysis_timeout=0.5, load_delay=3.0)
+        start = time.monotonic()
+        results, failed_pairs = analyzer.run_analysis()
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertEqual(results, [])
+        self.assertCountEqual(failed_pairs, self.PAIRS)
+
+    def test_pairs_within_budget_are_analyzed(self):
+        analyzer = self.make_analyzer(delay=0.0, analysis_timeout=60.0)
+        results, failed_pairs = analyzer.run_analysis()
+        self.assertEqual(failed_pairs, [])
+        self.assertEqual(len(results), len(self.PAIRS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,21 +1,348 @@
 """
 Analysis Engine - Versioned Implementation
 Version History:
+• v1.0.25 - Illiquid pair skips logged at DEBUG
+• v1.0.24 - Kernels no longer compiled in __init__; pool workers warm up via warmup_kernels
+• v1.0.23 - Dropped the per-process close metrics memo; unchanged pairs are skipped by the analyzer's results cache
+• v1.0.22 - Added warmup_kernels for compiling the kernels in worker processes
+• v1.0.21 - Numba kernels release the GIL while they run
+• v1.0.20 - Close metrics memoized per pair, timeframe and last candle
+• v1.0.19 - Report picks top / least volatile pairs with a partial selection
+• v1.0.18 - OHLCV arrays extracted as float32, kernels accumulate in float64
+• v1.0.17 - Mean ADX computed by a Numba kernel instead of talib.ADX
+• v1.0.16 - Coral threshold test without a per-candle division
+• v1.0.15 - Quality checks run on the extracted arrays with the row count taken once
+• v1.0.14 - Added batch_analyze for analyzing groups of pairs per call
+• v1.0.13 - STC rolling min/max deques held in window-sized ring buffers
+• v1.0.12 - Cheap quality and liquidity gates run before the indicators
+• v1.0.11 - Close metrics kernel scans float32 prices with float64 accumulators
+• v1.0.10 - Indicators share one set of extracted OHLCV arrays
+• v1.0.9 - Reject dataframes shorter than min_data_points
+• v1.0.8 - Null fractions scanned once per dataframe
+• v1.0.7 - Call TA-Lib function API on NumPy arrays instead of talib.abstract
+• v1.0.6 - Fused volatility, Coral and STC into a single Numba pass
+• v1.0.5 - Volatility computed by a Numba kernel instead of pandas rolling
 • v1.0.4 - Added version property for compatibility
 • v1.0.3 - Enhanced type hints and documentation
 • v1.0.2 - Added proper typing imports
 • v1.0.1 - Initial version split from analyzer_core
 """
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple, NamedTuple
 import pandas as pd
-import talib.abstract as ta
 import numpy as np
+from numba import njit
 import logging
 
 logger = logging.getLogger(__name__)
 
+def k_smallest_indices(values, k: int) -> np.ndarray:
+    """
+    Indices of the ``k`` smallest values in ascending order, in O(N)
+
+    Same result as the first ``k`` entries of a stable sort (ties keep their
+    original order), found with np.partition instead of sorting everything.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    k = min(max(k, 0), values.size)
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k == values.size:
+        return np.argsort(values, kind='stable')
+        
+    threshold = np.partition(values, k - 1)[k - 1]
+    below = np.flatnonzero(values < threshold)
+    ties = np.flatnonzero(values == threshold)[:k - below.size]
+    selected = np.concatenate([below, ties])
+    return selected[np.argsort(values[selected], kind='stable')]
+
+class OHLCVArrays(NamedTuple):
+    """Contiguous float32 views of the OHLCV columns, extracted once per pair"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, dataframe: pd.DataFrame) -> 'OHLCVArrays':
+        """Extract the OHLCV columns without copying when already float32 and contiguous"""
+        return cls(*(
+            np.ascontiguousarray(dataframe[col].to_numpy(dtype=np.float32, copy=False))
+            for col in cls._fields
+        ))
+
+@njit(cache=True, nogil=True)
+def _welford_add(value: float, nobs: int, mean: float, ssqdm: float):
+    """Add ``value`` to a running mean / sum of squared deviations (NaN skipped)"""
+    if value == value:
+        nobs += 1
+        delta = value - mean
+        mean += delta / nobs
+        ssqdm += (nobs - 1) * delta * delta / nobs
+    return nobs, mean, ssqdm
+
+@njit(cache=True, nogil=True)
+def _welford_remove(value: float, nobs: int, mean: float, ssqdm: float):
+    """Remove ``value`` from a running mean / sum of squared deviations (NaN skipped)"""
+    if value == value:
+        nobs -= 1
+        if nobs > 0:
+            delta = value - mean
+            mean -= delta / nobs
+            ssqdm -= (nobs + 1) * delta * delta / nobs
+        else:
+            mean = 0.0
+            ssqdm = 0.0
+    return nobs, mean, ssqdm
+
+@njit(cache=True, nogil=True)
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    """True range in TA-Lib's comparison order (matches its NaN handling)"""
+    true_range = high - low
+    gap = abs(high - prev_close)
+    if gap > true_range:
+        true_range = gap
+    gap = abs(low - prev_close)
+    if gap > true_range:
+        true_range = gap
+    return true_range
+
+@njit(cache=True, nogil=True)
+def _adx_mean(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> float:
+    """
+    Mean of the ADX(period) series without materializing it.
+
+    Inputs may be float32; every price is widened to float64 on read.
+
+    Follows TA-Lib's TA_ADX step for step (Wilder smoothing, DI / DX skipped
+    on a zero range, output starting 2 * period - 1 candles after the first
+    complete candle) so the result equals ``nanmean(talib.ADX(...))``.
+    Returns NaN when the series is too short to produce a value.
+    """
+    n = close.shape[0]
+    # TA-Lib starts at the first candle where no input is missing
+    start = 0
+    while start < n and (high[start] != high[start] or low[start] != low[start]
+                         or close[start] != close[start]):
+        start += 1
+    if n - start <= 2 * period - 1:
+        return np.nan
+
+    today = start
+    prev_high = np.float64(high[today])
+    prev_low = np.float64(low[today])
+    prev_close = np.float64(close[today])
+    plus_dm, minus_dm, tr = 0.0, 0.0, 0.0
+    adx = 0.0
+    adx_sum, adx_count = 0.0, 0
+
+    # Candles 1 .. period - 1 seed the DM / TR sums, the next period candles
+    # seed the ADX with the mean DX, and every later candle smooths it
+    for step in range(1, n - start):
+        today += 1
+        today_high = np.float64(high[today])
+        today_low = np.float64(low[today])
+        diff_plus = today_high - prev_high
+        prev_high = today_high
+        diff_minus = prev_low - today_low
+        prev_low = today_low
+        if step >= period:
+            minus_dm -= minus_dm / period
+            plus_dm -= plus_dm / period
+        if diff_minus > 0 and diff_plus < diff_minus:
+            minus_dm += diff_minus
+        elif diff_plus > 0 and diff_plus > diff_minus:
+            plus_dm += diff_plus
+        true_range = _true_range(prev_high, prev_low, prev_close)
+        if step >= period:
+            tr = tr - tr / period + true_range
+        else:
+            tr += true_range
+        prev_close = np.float64(close[today])
+        if step < period:
+            continue
+
+        # Like TA-Lib, DX is skipped (not zeroed) when TR or the DI sum is
+        # zero or NaN, which holds the ADX at its last value
+        if tr > 0.0 or tr < 0.0:
+            minus_di = 100 * (minus_dm / tr)
+            plus_di = 100 * (plus_dm / tr)
+            di_sum = minus_di + plus_di
+            if di_sum > 0.0 or di_sum < 0.0:
+                dx = 100 * (abs(minus_di - plus_di) / di_sum)
+                if step < 2 * period:
+                    adx += dx
+                else:
+                    adx = (adx * (period - 1) + dx) / period
+        if step < 2 * period - 1:
+            continue
+        if step == 2 * period - 1:
+            adx /= period
+
+        if adx == adx:
+            adx_sum += adx
+            adx_count += 1
+
+    return adx_sum / adx_count if adx_count > 0 else np.nan
+
+@njit(cache=True, nogil=True)
+def _close_metrics(close: np.ndarray):
+    """
+    Volatility, Coral Trend and STC scores from a single pass over ``close``.
+
+    ``close`` is expected as float32 (see OHLCVArrays) to halve the bytes
+    scanned; every candle is widened to float64 before it enters a running
+    statistic.
+
+    Returns ``(volatility, coral, stc)`` where:
+    • volatility - mean rolling(14) std of log returns, not annualized
+    • coral - share of candles with |diff(L) / (std(L) * sqrt(L))| > 1, L = min(20, n // 2)
+    • stc - mean absolute change of the stochastic(10) of the EMA(23) - EMA(50) MACD
+
+    Each value is NaN when the series is too short for that indicator.
+    Rolling windows follow pandas semantics: a window containing a missing
+    candle produces no value, and EMAs are seeded with an SMA like TA-Lib.
+    """
+    n = close.shape[0]
+
+    # Volatility: sliding Welford over log returns, taken as differences of
+    # log prices so each candle needs one log. Returns are kept in a float64
+    # ring buffer for removal, as float32 log prices would lose precision
+    vol_window = min(14, n)
+    vol_returns = np.empty(max(vol_window, 1))
+    prev_log = np.nan
+    vol_nobs, vol_mean, vol_ssqdm = 0, 0.0, 0.0
+    vol_sum, vol_count = 0.0, 0
+
+    # Coral: sliding Welford over close plus the L-candle difference
+    coral_enabled = n >= 20
+    coral_length = min(20, n // 2)
+    coral_scale = np.sqrt(coral_length)
+    coral_nobs, coral_mean, coral_ssqdm = 0, 0.0, 0.0
+    coral_hits = 0
+
+    # STC: two recursive EMAs feeding a rolling min/max of the MACD
+    stoch_window = min(10, n // 5)
+    stc_enabled = n >= 50 and stoch_window >= 2
+    fast_period = min(23, n // 3)
+    slow_period = min(50, n // 2)
+    fast_k = 2.0 / (fast_period + 1)
+    slow_k = 2.0 / (slow_period + 1)
+    ema_start = 0
+    while ema_start < n - 1 and np.isnan(close[ema_start]):
+        ema_start += 1
+    fast_ema, slow_ema = 0.0, 0.0
+    # Monotonic deques of MACD values for the rolling max / min, stored in
+    # ring buffers of the window size; head and tail count pushes/pops and
+    # are mapped into the buffers modulo the window
+    ring = max(stoch_window, 1)
+    max_vals = np.empty(ring)
+    max_idx = np.empty(ring, dtype=np.int64)
+    min_vals = np.empty(ring)
+    min_idx = np.empty(ring, dtype=np.int64)
+    max_head, max_tail, min_head, min_tail = 0, 0, 0, 0
+    last_nan = -1
+    prev_stoch = np.nan
+    stc_sum, stc_count = 0.0, 0
+
+    for i in range(n):
+        price = np.float64(close[i])
+
+        log_price = np.log(price)
+        log_return = log_price - prev_log
+        prev_log = log_price
+        slot = i % vol_window
+        expired = vol_returns[slot]
+        vol_returns[slot] = log_return
+        vol_nobs, vol_mean, vol_ssqdm = _welford_add(
+            log_return, vol_nobs, vol_mean, vol_ssqdm)
+        if i >= vol_window:
+            vol_nobs, vol_mean, vol_ssqdm = _welford_remove(
+                expired, vol_nobs, vol_mean, vol_ssqdm)
+        if vol_nobs >= vol_window and vol_nobs > 1:
+            vol_sum += np.sqrt(max(vol_ssqdm, 0.0) / (vol_nobs - 1))
+            vol_count += 1
+
+        if coral_enabled:
+            coral_nobs, coral_mean, coral_ssqdm = _welford_add(
+                price, coral_nobs, coral_mean, coral_ssqdm)
+            if i >= coral_length:
+                old = np.float64(close[i - coral_length])
+                coral_nobs, coral_mean, coral_ssqdm = _welford_remove(
+                    old, coral_nobs, coral_mean, coral_ssqdm)
+                if coral_nobs >= coral_length and coral_nobs > 1:
+                    # |diff| / threshold > 1 tested as |diff| > threshold, the
+                    # threshold being positive, so no division per candle
+                    std = np.sqrt(max(coral_ssqdm, 0.0) / (coral_nobs - 1))
+                    if abs(price - old) > std * coral_scale + 1e-8:
+                        coral_hits += 1
+
+        if stc_enabled:
+            macd = np.nan
+            if i >= ema_start:
+                seen = i - ema_start
+                if seen < fast_period:
+                    fast_ema += price
+                    if seen == fast_period - 1:
+                        fast_ema /= fast_period
+                else:
+                    fast_ema += fast_k * (price - fast_ema)
+                if seen < slow_period:
+                    slow_ema += price
+                    if seen == slow_period - 1:
+                        slow_ema /= slow_period
+                else:
+                    slow_ema += slow_k * (price - slow_ema)
+                if seen >= slow_period - 1 and seen >= fast_period - 1:
+                    macd = fast_ema - slow_ema
+
+            stoch = np.nan
+            if macd != macd:
+                last_nan = i
+                max_head, max_tail, min_head, min_tail = 0, 0, 0, 0
+            else:
+                # Expire the candle leaving the window first so neither deque
+                # ever holds more than stoch_window entries
+                if max_tail > max_head and max_idx[max_head % ring] <= i - stoch_window:
+                    max_head += 1
+                if min_tail > min_head and min_idx[min_head % ring] <= i - stoch_window:
+                    min_head += 1
+                while max_tail > max_head and max_vals[(max_tail - 1) % ring] <= macd:
+                    max_tail -= 1
+                max_vals[max_tail % ring] = macd
+                max_idx[max_tail % ring] = i
+                max_tail += 1
+                while min_tail > min_head and min_vals[(min_tail - 1) % ring] >= macd:
+                    min_tail -= 1
+                min_vals[min_tail % ring] = macd
+                min_idx[min_tail % ring] = i
+                min_tail += 1
+                if i - last_nan >= stoch_window:
+                    lowest = min_vals[min_head % ring]
+                    stoch = 100 * (macd - lowest) / (max_vals[max_head % ring] - lowest + 1e-8)
+
+            if stoch == stoch and prev_stoch == prev_stoch:
+                stc_sum += abs(stoch - prev_stoch)
+                stc_count += 1
+            prev_stoch = stoch
+
+    volatility = vol_sum / vol_count if vol_count > 0 else np.nan
+    coral_score = coral_hits / n if coral_enabled else np.nan
+    stc_score = stc_sum / stc_count if stc_count > 0 else np.nan
+    return volatility, coral_score, stc_score
+
+def warmup_kernels() -> None:
+    """
+    Compile (or load from the on-disk cache) the Numba kernels, so the first
+    pair analyzed in a process doesn't pay for it; usable as a pool initializer
+    """
+    ones = np.ones(2, dtype=np.float32)
+    _close_metrics(ones)
+    _adx_mean(ones, ones, ones, 2)
+
 class AnalysisEngine:
-    CURRENT_VERSION = "1.0.4"
+    CURRENT_VERSION = "1.0.25"
+    OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
     
     def __init__(
         self,
@@ -23,10 +350,14 @@ class AnalysisEngine:
         max_null_percentage: float = 0.2,
         top_pairs_count: int = 10,
         least_pairs_count: int = 10,
-        timeframe: str = '1h'
+        timeframe: str = '1h',
+        min_data_points: int = 30,
+        min_mean_volume: float = 0.0
     ):
         self._version = self.CURRENT_VERSION
         self.min_data_quality = min_data_quality
+        self.min_data_points = min_data_points
+        self.min_mean_volume = min_mean_volume
         self.max_null_percentage = max_null_percentage
         self.top_pairs_count = top_pairs_count
         self.least_pairs_count = least_pairs_count
@@ -38,153 +369,153 @@ class AnalysisEngine:
         """Get current engine version"""
         return self._version
 
-    def _calculate_volatility(self, dataframe: pd.DataFrame) -> float:
-        """Calculate annualized volatility from OHLCV data"""
-        try:
-            returns = np.log(dataframe['close'] / dataframe['close'].shift(1))
-            volatility = returns.rolling(window=min(14, len(returns))).std().mean()
-            
-            # Handle NaN values
-            if pd.isna(volatility):
-                return 0.0
-                
-            # Annualize based on timeframe
-            timeframe_multipliers = {
-                '1m': np.sqrt(525600),   # minutes in a year
-                '5m': np.sqrt(105120),   # 5-min periods in a year
-                '15m': np.sqrt(35040),   # 15-min periods in a year
-                '1h': np.sqrt(8760),     # hours in a year
-                '4h': np.sqrt(2190),     # 4-hour periods in a year
-                '1d': np.sqrt(365),      # days in a year
-            }
-            
-            multiplier = timeframe_multipliers.get(self.timeframe, np.sqrt(365))
-            return float(volatility * multiplier)
+    def _annualize_volatility(self, volatility: float) -> float:
+        """Annualize per-candle volatility based on the timeframe"""
+        # Handle NaN values
+        if pd.isna(volatility):
+            return 0.0
             
+        timeframe_multipliers = {
+            '1m': np.sqrt(525600),   # minutes in a year
+            '5m': np.sqrt(105120),   # 5-min periods in a year
+            '15m': np.sqrt(35040),   # 15-min periods in a year
+            '1h': np.sqrt(8760),     # hours in a year
+            '4h': np.sqrt(2190),     # 4-hour periods in a year
+            '1d': np.sqrt(365),      # days in a year
+        }
+        
+        multiplier = timeframe_multipliers.get(self.timeframe, np.sqrt(365))
+        return float(volatility * multiplier)
+
+    def _calculate_trend_strength(self, arrays: OHLCVArrays, pair: str) -> float:
+        """Calculate trend strength as the mean ADX"""
+        try:
+            period = min(14, len(arrays.close)//3)
+            if period < 2:
+                raise ValueError(f"ADX period {period} too short")
+            adx_mean = _adx_mean(arrays.high, arrays.low, arrays.close, period)
+            return float(adx_mean) if not np.isnan(adx_mean) else 0.0
         except Exception as e:
-            logger.warning(f"Error calculating volatility: {e}")
+            logger.debug(f"ADX calculation failed for {pair}, using fallback: {e}")
+            # Fallback trend calculation
+            price_change = np.abs(np.diff(arrays.close) / arrays.close[:-1])
+            price_change = price_change[~np.isnan(price_change)]
+            return float(price_change.mean() * 100) if price_change.size else 0.0
+
+    @staticmethod
+    def _mean_volume(arrays: OHLCVArrays) -> float:
+        """Mean volume ignoring missing candles (NaN when there is none)"""
+        volume = arrays.volume[~np.isnan(arrays.volume)]
+        return float(volume.mean(dtype=np.float64)) if volume.size else np.nan
+
+    def _calculate_volume_score(self, mean_volume: float) -> float:
+        """Calculate log-scaled mean volume"""
+        try:
+            volume_score = float(np.log1p(mean_volume))
+            return volume_score if not pd.isna(volume_score) else 0.0
+        except Exception:
             return 0.0
 
-    def _calculate_coral_score(self, dataframe: pd.DataFrame) -> float:
-        """Calculate Coral Trend effectiveness score"""
+    def _calculate_close_metrics(self, arrays: OHLCVArrays) -> Tuple[float, float, float]:
+        """Calculate annualized volatility, Coral Trend and STC scores in one pass"""
         try:
-            if len(dataframe) < 20:
-                return 0.0
-                
-            length = min(20, len(dataframe) // 2)
-            diff = dataframe['close'].diff(length)
-            std = dataframe['close'].rolling(length).std()
+            volatility, coral_score, stc_score = _close_metrics(arrays.close)
             
-            # Avoid division by zero
-            coral = diff / (std * np.sqrt(length) + 1e-8)
-            score = (coral.abs() > 1.0).mean()
-            
-            return float(score) if not pd.isna(score) else 0.0
+            return (
+                self._annualize_volatility(volatility),
+                float(coral_score) if not pd.isna(coral_score) else 0.0,
+                float(stc_score) if not pd.isna(stc_score) else 0.0
+            )
             
         except Exception as e:
-            logger.warning(f"Error calculating coral score: {e}")
-            return 0.0
+            logger.warning(f"Error calculating close-based metrics: {e}")
+            return 0.0, 0.0, 0.0
 
-    def _calculate_stc_score(self, dataframe: pd.DataFrame) -> float:
-        """Calculate Schaff Trend Cycle effectiveness"""
-        try:
-            if len(dataframe) < 50:
-                return 0.0
-                
-            # Calculate MACD with error handling
-            try:
-                ema_fast = ta.EMA(dataframe, timeperiod=min(23, len(dataframe)//3))
-                ema_slow = ta.EMA(dataframe, timeperiod=min(50, len(dataframe)//2))
-                macd = ema_fast - ema_slow
-            except Exception:
-                # Fallback to simple moving averages
-                macd = dataframe['close'].rolling(12).mean() - dataframe['close'].rolling(26).mean()
+    def _has_enough_rows(self, n: int) -> bool:
+        """Check the candle count against the minimum"""
+        return n > 0 and n >= self.min_data_points
+
+    def _check_arrays(self, arrays: OHLCVArrays, n: int) -> Tuple[bool, np.ndarray]:
+        """
+        Validate extracted OHLCV arrays
+
+        Returns:
+            (quality_ok, null_fractions) with the fraction of missing values per column
+        """
+        null_fractions = np.array([np.count_nonzero(np.isnan(values)) for values in arrays]) / n
+        
+        # Check for excessive null values
+        if null_fractions.max() > self.max_null_percentage:
+            return False, null_fractions
             
-            # Calculate stochastic oscillator of MACD
-            window = min(10, len(macd)//5)
-            if window < 2:
-                return 0.0
+        # Check for reasonable price data (no negatives, etc.)
+        for prices in (arrays.open, arrays.high, arrays.low, arrays.close):
+            if (prices <= 0).any():
+                return False, null_fractions
                 
-            macd_min = macd.rolling(window).min()
-            macd_max = macd.rolling(window).max()
-            
-            # Avoid division by zero
-            denominator = macd_max - macd_min
-            stoch = 100 * (macd - macd_min) / (denominator + 1e-8)
-            
-            score = stoch.diff().abs().mean()
-            return float(score) if not pd.isna(score) else 0.0
-            
-        except Exception as e:
-            logger.warning(f"Error calculating STC score: {e}")
-            return 0.0
+        return True, null_fractions
 
     def check_data_quality(self, dataframe: pd.DataFrame) -> bool:
         """Validate data meets minimum quality thresholds"""
         try:
-            if dataframe.empty:
-                return False
-                
-            # Check minimum length
-            if len(dataframe) < len(dataframe) * self.min_data_quality:
-                return False
-                
-            # Check for excessive null values
-            null_pct = dataframe.isnull().mean().max()
-            if null_pct > self.max_null_percentage:
+            if not self._has_enough_rows(len(dataframe)):
                 return False
                 
             # Check for valid OHLCV data
-            required_columns = ['open', 'high', 'low', 'close', 'volume']
-            if not all(col in dataframe.columns for col in required_columns):
+            if not all(col in dataframe.columns for col in self.OHLCV_COLUMNS):
                 return False
                 
-            # Check for reasonable price data (no negatives, etc.)
-            price_columns = ['open', 'high', 'low', 'close']
-            for col in price_columns:
-                if (dataframe[col] <= 0).any():
-                    return False
-                    
-            return True
+            quality_ok, _ = self._check_arrays(OHLCVArrays.from_dataframe(dataframe), len(dataframe))
+            return quality_ok
             
         except Exception as e:
             logger.warning(f"Error checking data quality: {e}")
             return False
 
     def analyze_dataframe(self, dataframe: pd.DataFrame, pair: str) -> Optional[Dict[str, float]]:
-        """Analyze prepared OHLCV dataframe"""
+        """
+        Analyze prepared OHLCV dataframe
+
+        Work runs cheapest first so pairs that cannot qualify are rejected
+        before the indicator kernels and ADX, the most expensive call.
+        """
         try:
-            if not self.check_data_quality(dataframe):
+            n = len(dataframe)
+            if not self._has_enough_rows(n) or not all(col in dataframe.columns for col in self.OHLCV_COLUMNS):
+                logger.warning(f"Data quality check failed for {pair}")
+                return None
+
+            # Extract the OHLCV arrays once and share them across checks and indicators
+            arrays = OHLCVArrays.from_dataframe(dataframe)
+
+            quality_ok, null_fractions = self._check_arrays(arrays, n)
+            if not quality_ok:
                 logger.warning(f"Data quality check failed for {pair}")
                 return None
 
-            # Calculate ADX with error handling
-            try:
-                adx_value = ta.ADX(dataframe, timeperiod=min(14, len(dataframe)//3)).mean()
-                trend_strength = float(adx_value) if not pd.isna(adx_value) else 0.0
-            except Exception as e:
-                logger.debug(f"ADX calculation failed for {pair}, using fallback: {e}")
-                # Fallback trend calculation
-                price_change = dataframe['close'].pct_change().abs().mean()
-                trend_strength = float(price_change * 100) if not pd.isna(price_change) else 0.0
-
-            # Calculate volume score with error handling
-            try:
-                volume_score = float(np.log1p(dataframe['volume'].mean()))
-                if pd.isna(volume_score):
-                    volume_score = 0.0
-            except Exception:
-                volume_score = 0.0
+            data_quality = float(1 - null_fractions.mean())
+            if data_quality < self.min_data_quality:
+                logger.warning(f"Data quality {data_quality:.2f} below minimum for {pair}")
+                return None
+
+            mean_volume = self._mean_volume(arrays)
+            if mean_volume < self.min_mean_volume:
+                logger.debug(f"Skipping illiquid pair {pair}: mean volume {mean_volume:.2f}")
+                return None
+            volume_score = self._calculate_volume_score(mean_volume)
+
+            volatility, coral_score, stc_score = self._calculate_close_metrics(arrays)
+            trend_strength = self._calculate_trend_strength(arrays, pair)
 
             result = {
                 'pair': pair,
-                'volatility': self._calculate_volatility(dataframe),
+                'volatility': volatility,
                 'trend_strength': trend_strength,
                 'volume_score': volume_score,
-                'coral_score': self._calculate_coral_score(dataframe),
-                'stc_score': self._calculate_stc_score(dataframe),
-                'data_points': len(dataframe),
-                'data_quality': float(1 - dataframe.isnull().mean().mean()),
+                'coral_score': coral_score,
+                'stc_score': stc_score,
+                'data_points': n,
+                'data_quality': data_quality,
                 'timeframe': self.timeframe
             }
             
@@ -199,6 +530,15 @@ class AnalysisEngine:
             logger.error(f"Analysis error for {pair}: {str(e)}")
             return None
 
+    def batch_analyze(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, Optional[Dict[str, float]]]:
+        """
+        Analyze several pairs in one call
+
+        Lets callers ship a group of dataframes to a worker process at once
+        instead of paying task dispatch and pickling overhead per pair.
+        """
+        return {pair: self.analyze_dataframe(dataframe, pair) for pair, dataframe in frames.items()}
+
     def generate_report(self, results: List[Dict], failed_pairs: List[str]) -> Dict:
         """
         Generate a report including top and least volatile pairs.
@@ -213,9 +553,17 @@ class AnalysisEngine:
                     'least_volatile_pairs': []
                 }
             
-            sorted_by_volatility = sorted(results, key=lambda x: x.get('volatility', 0), reverse=True)
-            top_pairs = [res['pair'] for res in sorted_by_volatility[:self.top_pairs_count]]
-            least_pairs = [res['pair'] for res in sorted_by_volatility[-self.least_pairs_count:]] if self.least_pairs_count > 0 else []
+            # Top / least k by volatility without sorting every result; ranks match
+            # a stable descending sort (ties keep their order in results)
+            volatility = np.array([res.get('volatility', 0) for res in results], dtype=np.float64)
+            top_pairs = [results[i]['pair'] for i in k_smallest_indices(-volatility, self.top_pairs_count)]
+            # The tail of the descending order is the head of the ascending
+            # order over reversed results, read backwards
+            last = len(results) - 1
+            least_pairs = [
+                results[last - i]['pair']
+                for i in k_smallest_indices(volatility[::-1], self.least_pairs_count)[::-1]
+            ]
 
             return {
                 'total_pairs': len(results) + len(failed_pairs),
@@ -1,30 +1,84 @@
 """
 Robust Config Handler with Comprehensive Error Handling
 Version History:
+• v1.4.6 - Verified directories kept in the module instead of the freqtrade config
+• v1.4.5 - Required directories write-tested in strict mode, which raises if not writable
+• v1.4.4 - Config files parsed with orjson when available
+• v1.4.3 - Parsed config files cached by path and modification time
+• v1.4.2 - Required directories created once and recorded in _verified_dirs
+• v1.4.1 - Permission checks use a cached os.access instead of touching files
 • v1.4.0 - Fixed path resolution for pair_analyzer subdirectory structure
 • v1.3.0 - Added directory creation and permission checks
 """
+import copy
 import json
 from pathlib import Path
+import functools
 import logging
 import os
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    # Fallback to the standard library parser if orjson is not installed
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Version information
-VERSION = "1.4.0"
+VERSION = "1.4.6"
+
+# Directories created and write-tested by load_config in this process
+_verified_dirs = set()
+
+def is_verified_directory(path: Path) -> bool:
+    """Check if load_config already created and write-tested a directory"""
+    return str(path) in _verified_dirs
+
+@functools.lru_cache(maxsize=64)
+def _has_write_access(path_str: str) -> bool:
+    """Cached os.access write check for a directory path"""
+    return os.access(path_str, os.W_OK)
+
+def check_directory_permissions(path: Path, strict: bool = False) -> bool:
+    """
+    Check if we have write permissions to a directory
+
+    Args:
+        path: Directory to check
+        strict: Create and remove a test file instead of trusting os.access,
+            raising PermissionError if the directory isn't writable
 
-def check_directory_permissions(path: Path) -> bool:
-    """Check if we have write permissions to a directory"""
+    Raises:
+        PermissionError: In strict mode, when the test file can't be written
+    """
+    if not strict:
+        return _has_write_access(str(path))
+    
     try:
         test_file = path / '.permission_test'
         test_file.touch()
         test_file.unlink()
         return True
-    except (PermissionError, OSError) as e:
-        logger.debug(f"Permission check failed for {path}: {str(e)}")
-        return False
+    except OSError as e:
+        raise PermissionError(f"Directory {path} is not writable: {str(e)}") from e
+
+@functools.lru_cache(maxsize=4)
+def _load_json_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a JSON file; keyed on mtime so edits invalidate the cache"""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        with open(path_str, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path_str) as f:
+        return json.load(f)
+
+def load_json_file(path: Path) -> Dict[str, Any]:
+    """Load a JSON config file, reusing the parsed result while the file is unchanged"""
+    data = _load_json_cached(str(path), path.stat().st_mtime_ns)
+    # Hand out a copy so callers can't modify the cached object
+    return copy.deepcopy(data)
 
 def get_project_root() -> Path:
     """Return the freqtrade project root with specific handling for pair_analyzer structure"""
@@ -79,12 +133,17 @@ def load_config(quote_currency: Optional[str] = None) -> Dict[str, Any]:
     logger.info(f"Using freqtrade root: {freqtrade_root}")
     logger.info(f"User data directory: {user_data_dir}")
     
-    # Create required directories
-    for directory in [user_data_dir, private_dir]:
+    data_dir = user_data_dir / 'data'
+    strategies_dir = user_data_dir / 'strategies'
+    
+    # Create required directories in a single pass and remember which ones
+    # succeeded so later components don't repeat the work
+    for directory in [user_data_dir, private_dir, data_dir, strategies_dir]:
         try:
-            directory.mkdir(parents=True, exist_ok=True)
-            if not check_directory_permissions(directory):
-                logger.warning(f"Limited permissions for {directory}")
+            os.makedirs(directory, exist_ok=True)
+            # Real write test, run once here so later checks can trust the result
+            check_directory_permissions(directory, strict=True)
+            _verified_dirs.add(str(directory))
         except Exception as e:
             logger.error(f"Failed to create/access directory {directory}: {str(e)}")
     
@@ -110,8 +169,7 @@ def load_config(quote_currency: Optional[str] = None) -> Dict[str, Any]:
         try:
             if config_path and config_path.exists():
                 logger.debug(f"Trying to load config from: {config_path}")
-                with open(config_path) as f:
-                    config_data = json.load(f)
+                config_data = load_json_file(config_path)
                 used_path = config_path
                 logger.info(f"✓ Loaded config from: {config_path}")
                 break
@@ -134,9 +192,6 @@ def load_config(quote_currency: Optional[str] = None) -> Dict[str, Any]:
         config_data['exchange'] = {'name': 'binance'}
     
     # Build final config with absolute paths
-    data_dir = user_data_dir / 'data'
-    strategies_dir = user_data_dir / 'strategies'
-    
     final_config = {
         'runmode': config_data.get('runmode', 'dry_run'),
         'exchange': {
@@ -160,13 +215,6 @@ def load_config(quote_currency: Optional[str] = None) -> Dict[str, Any]:
         '_freqtrade_root': str(freqtrade_root)
     }
     
-    # Create data and strategies directories
-    for dir_path in [data_dir, strategies_dir]:
-        try:
-            dir_path.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            logger.warning(f"Could not create directory {dir_path}: {e}")
-    
     # Log configuration details
     logger.info(f"Configuration summary:")
     logger.info(f"  Exchange: {final_config['exchange']['name']}")
@@ -1,18 +1,64 @@
 """
 Core Analyzer - Versioned Implementation
 Version History:
+• v2.13.24 - Analysis workers started from a fork server, not forked from the threaded parent
+• v2.13.23 - Minimum mean volume passed through to the analysis engine
+• v2.13.22 - Results cache merged across runs, pruned by age and engine version, keyed on filter settings
+• v2.13.21 - Time budget covers pair loading and stops running workers when exceeded
+• v2.13.20 - Analysis time budget can be passed to the constructor
+• v2.13.19 - Shared exchanges reference counted and closed by the last close(); keyed by stake currency too
+• v2.13.18 - Duplicate override pairs dropped, keeping their first position
+• v2.13.17 - Pairs to analyze can be passed in instead of taken from the markets
+• v2.13.16 - Analysis worker processes compile the Numba kernels at startup
+• v2.13.15 - Per-pair results cached on disk and reused while the candles are unchanged
+• v2.13.14 - Result collection with wait(FIRST_COMPLETED) and an optional time budget
+• v2.13.13 - Exchange connections shared across analyzer instances
+• v2.13.12 - Results files written as compact JSON
+• v2.13.11 - Per-pair success logging moved to DEBUG with periodic progress lines
+• v2.13.10 - Valid pair selection cached with the markets
+• v2.13.9 - Added close() and context manager support to release the exchange
+• v2.13.8 - Pair data loaded with executor.map instead of per-pair futures
+• v2.13.7 - Dataframes sent to the process pool in batches
+• v2.13.6 - Default quote currency taken from the loaded config
+• v2.13.5 - Skip directories already created by load_config
+• v2.13.4 - Missing pair data downloaded in one batch before analysis
+• v2.13.3 - Results serialized once with orjson when available
+• v2.13.2 - Cache exchange markets at initialization
+• v2.13.1 - Vectorized composite score calculation
+• v2.13.0 - Indicator math runs in a process pool, data loading stays on threads
 • v2.12.2 - Fixed import paths for new structure
 • v2.12.1 - Updated for fixed DataManager
 • v2.12.0 - Enhanced pair filtering
 """
-from typing import Dict, Optional, List, Tuple
+from typing import Any, Dict, Optional, List, Tuple
+import atexit
+from contextlib import contextmanager
+import hashlib
+import multiprocessing
+import os
+import shelve
+import threading
 import time
 import json
 from datetime import datetime
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError, wait, FIRST_COMPLETED
 from freqtrade.resolvers import ExchangeResolver
 from freqtrade.data.dataprovider import DataProvider
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    # Fallback to the standard library encoder if orjson is not installed
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    # No file locking on platforms without fcntl (Windows)
+    fcntl = None
 
 # Import our local modules with proper paths
 import sys
@@ -29,32 +75,120 @@ except ImportError:
         print(f"Freqtrade Pair Analyzer v{version} - Quote: {quote_currency}")
 
 import logging
-from .analysis_engine import AnalysisEngine
+from .analysis_engine import AnalysisEngine, warmup_kernels
 from .data_manager import DataManager
-from .config_handler import load_config, check_directory_permissions
+from .config_handler import load_config, check_directory_permissions, is_verified_directory
 
 logger = logging.getLogger(__name__)
 
+# Exchange connections shared by analyzers in the process, keyed by exchange
+# name, stake currency and API key, so a second analyzer with the same config
+# skips the TLS handshake and market download. Each entry holds the exchange
+# and the number of analyzers using it; the last one to close() closes it.
+_shared_exchanges: Dict[Tuple[str, str, int], List[Any]] = {}
+_shared_exchanges_lock = threading.Lock()
+
+def _get_shared_exchange(config: Dict[str, Any]):
+    """Return the process-wide exchange for this config, loading it on first use"""
+    key = (
+        config['exchange']['name'],
+        config.get('stake_currency', ''),
+        hash(config['exchange'].get('key', ''))
+    )
+    with _shared_exchanges_lock:
+        entry = _shared_exchanges.get(key)
+        if entry is None:
+            entry = [ExchangeResolver.load_exchange(config, validate=False), 0]
+            _shared_exchanges[key] = entry
+        else:
+            logger.info(f"Reusing {entry[0].name} connection")
+        entry[1] += 1
+        return entry[0]
+
+def _release_shared_exchange(exchange) -> None:
+    """Drop one reference to a shared exchange, closing it when unused"""
+    with _shared_exchanges_lock:
+        for key, entry in _shared_exchanges.items():
+            if entry[0] is exchange:
+                entry[1] -= 1
+                if entry[1] > 0:
+                    return
+                del _shared_exchanges[key]
+                break
+    try:
+        exchange.close()
+    except Exception as e:
+        logger.debug(f"Error closing exchange: {str(e)}")
+
+def close_shared_exchanges() -> None:
+    """Close every shared exchange connection (also run at interpreter exit)"""
+    with _shared_exchanges_lock:
+        exchanges = [entry[0] for entry in _shared_exchanges.values()]
+        _shared_exchanges.clear()
+    for exchange in exchanges:
+        try:
+            exchange.close()
+        except Exception as e:
+            logger.debug(f"Error closing exchange: {str(e)}")
+
+atexit.register(close_shared_exchanges)
+
+# Analysis workers are started by a fork server instead of forking this
+# process, which already runs the data loading threads at that point; the
+# server imports the engine once so each worker doesn't have to
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    _worker_context = multiprocessing.get_context('forkserver')
+    _worker_context.set_forkserver_preload([AnalysisEngine.__module__])
+else:
+    _worker_context = multiprocessing.get_context('spawn')
+
 class VersionedAnalyzer:
     """
     Main analyzer class that orchestrates the entire analysis process
     """
-    CURRENT_VERSION = "2.12.2"
+    CURRENT_VERSION = "2.13.24"
+    
+    # Composite score components: (result key, weight, cap used for normalization)
+    SCORE_COMPONENTS = (
+        ('trend_strength', 0.3, 100),
+        ('volatility', 0.25, 5),
+        ('volume_score', 0.2, 20),
+        ('coral_score', 0.15, 1),
+        ('stc_score', 0.1, 100)
+    )
     
-    def __init__(self, quote_currency: Optional[str] = None, max_workers: int = 8):
+    # Upper bound on pairs sent to a worker process per analysis task
+    ANALYSIS_BATCH_SIZE = 32
+    # Log one progress line per this many analyzed pairs
+    PROGRESS_LOG_INTERVAL = 100
+    # Per-pair results kept between runs, keyed on the candles they were computed from
+    RESULT_CACHE_PATH = Path('user_data/analysis_results/.cache/analysis_results')
+    # Cached results not used by any run for this many seconds are dropped
+    RESULT_CACHE_MAX_AGE = 7 * 24 * 3600
+    
+    def __init__(self, quote_currency: Optional[str] = None, max_workers: int = 8,
+                 override_pairs: Optional[List[str]] = None,
+                 analysis_timeout: Optional[float] = None, min_mean_volume: float = 0.0):
         self._version = self.CURRENT_VERSION
         logger.info(f"Initializing Analyzer v{self._version}")
         
-        # Initialize configuration
-        self.quote_currency = quote_currency or self._get_default_quote_currency()
+        # Initialize configuration; without an explicit quote currency the
+        # config's stake currency is used
+        self.config = load_config(quote_currency)
+        self.quote_currency = quote_currency or self.config['stake_currency']
         self.max_workers = max_workers
+        # Explicit pairs to analyze (e.g. from pairlist configs) instead of
+        # every valid market pair; a pair listed twice is only loaded and
+        # analyzed once
+        self.override_pairs = list(dict.fromkeys(override_pairs)) if override_pairs else None
+        if override_pairs and len(self.override_pairs) < len(override_pairs):
+            logger.info(f"Dropped {len(override_pairs) - len(self.override_pairs)} duplicate pairs")
         
         try:
             print_banner(VERSION, self.quote_currency)
         except:
             print(f"Freqtrade Pair Analyzer v{self._version} - Quote: {self.quote_currency}")
             
-        self.config = load_config(self.quote_currency)
         self._ensure_directories_exist()
         
         # Analysis parameters
@@ -62,17 +196,24 @@ class VersionedAnalyzer:
         self.days_to_analyze = 90
         self.extra_days = 7
         self.min_data_points = 30
+        # Wall-clock budget in seconds for loading and analyzing pairs (None = unlimited)
+        self.analysis_timeout = analysis_timeout
+        # Pairs with a lower mean candle volume are skipped as illiquid
+        self.min_mean_volume = min_mean_volume
         
         # Initialize components
         self.exchange = self._initialize_exchange()
         self.dataprovider = DataProvider(self.config, self.exchange)
         self.data_manager = DataManager(self.config, self.exchange, self.timeframe)
-        self.analysis_engine = AnalysisEngine()
+        self.analysis_engine = AnalysisEngine(
+            min_data_points=self.min_data_points,
+            min_mean_volume=self.min_mean_volume
+        )
         
         self.start_time = time.time()
 
     def _ensure_directories_exist(self) -> None:
-        """Create required analysis directories"""
+        """Create required analysis directories not already verified by load_config"""
         required_dirs = [
             Path(self.config.get('datadir', 'user_data/data')),
             Path('user_data/analysis_results'),
@@ -83,8 +224,10 @@ class VersionedAnalyzer:
         ]
         
         for directory in required_dirs:
+            if is_verified_directory(directory):
+                continue
             try:
-                directory.mkdir(parents=True, exist_ok=True)
+                os.makedirs(directory, exist_ok=True)
                 if not check_directory_permissions(directory):
                     logger.warning(f"Limited permissions for {directory}")
             except Exception as e:
@@ -94,37 +237,45 @@ class VersionedAnalyzer:
         """Initialize and validate exchange connection"""
         logger.info("Initializing exchange connection...")
         try:
-            exchange = ExchangeResolver.load_exchange(self.config, validate=False)
+            exchange = _get_shared_exchange(self.config)
             markets = exchange.get_markets()
             if not markets:
+                _release_shared_exchange(exchange)
                 raise ConnectionError("No markets returned from exchange")
             logger.info(f"Connected to {exchange.name} with {len(markets)} pairs")
+            # Cache markets so pair selection doesn't query the exchange again
+            self._markets = markets
+            self._valid_pairs = None
             return exchange
         except Exception as e:
             logger.error(f"Failed to initialize exchange: {str(e)}")
             raise
 
-    def _get_default_quote_currency(self) -> str:
-        """Get default quote currency from config"""
-        try:
-            from .config_handler import get_project_root
-            config_path = get_project_root() / 'user_data' / 'private' / 'config-private.json'
-            if config_path.exists():
-                with open(config_path) as f:
-                    config = json.load(f)
-                return config.get('stake_currency', 'USDT')
-        except Exception as e:
-            logger.warning(f"Using default USDT: {str(e)}")
-        return 'USDT'
+    @property
+    def markets(self) -> Dict[str, Dict]:
+        """Exchange markets cached at initialization"""
+        return self._markets
+
+    def refresh_markets(self) -> Dict[str, Dict]:
+        """Reload the cached markets from the exchange"""
+        self._markets = self.exchange.get_markets()
+        self._valid_pairs = None
+        logger.info(f"Refreshed markets: {len(self._markets)} pairs")
+        return self._markets
 
     def _get_valid_pairs(self) -> List[str]:
-        """Get valid trading pairs with proper filtering"""
+        """Get valid trading pairs with proper filtering (cached until markets are refreshed)"""
+        if self.override_pairs:
+            return list(self.override_pairs)
+        if self._valid_pairs is not None:
+            return list(self._valid_pairs)
         try:
-            markets = self.exchange.get_markets()
+            markets = self._markets
             valid_pairs = []
+            quote_suffix = f"/{self.quote_currency}"
             
             for pair, info in markets.items():
-                if (pair.endswith(f"/{self.quote_currency}") and 
+                if (pair.endswith(quote_suffix) and 
                     info.get('active', False) and
                     info.get('spot', True) and
                     not info.get('margin', False) and  # Exclude margin pairs
@@ -132,15 +283,16 @@ class VersionedAnalyzer:
                     valid_pairs.append(pair)
             
             logger.info(f"Found {len(valid_pairs)} valid {self.quote_currency} pairs")
+            self._valid_pairs = tuple(valid_pairs)
             return valid_pairs
         except Exception as e:
             logger.error(f"Error getting valid pairs: {str(e)}")
             return []
 
-    def analyze_pair(self, pair: str) -> Optional[Dict[str, float]]:
-        """Execute full analysis for a single pair"""
+    def _fetch_pair_data(self, pair: str) -> Optional[pd.DataFrame]:
+        """Load (downloading if needed) the OHLCV data for a single pair"""
         try:
-            logger.debug(f"Analyzing {pair}")
+            logger.debug(f"Loading data for {pair}")
             dataframe = self.data_manager.ensure_pair_data(
                 pair,
                 self.days_to_analyze + self.extra_days
@@ -149,18 +301,123 @@ class VersionedAnalyzer:
             if dataframe is None or len(dataframe) < self.min_data_points:
                 logger.warning(f"Insufficient data for {pair}: {len(dataframe) if dataframe is not None else 0} points")
                 return None
+            return dataframe
+            
+        except Exception as e:
+            logger.error(f"Data loading failed for {pair}: {str(e)}")
+            return None
+
+    def _result_cache_key(self, pair: str, dataframe: pd.DataFrame) -> Optional[str]:
+        """
+        Cache key identifying a pair's candles, or None without timestamps
+
+        The key covers the engine version and filter settings and a digest of
+        the OHLCV values, so re-downloaded candles or engine changes never
+        reuse stale results.
+        """
+        try:
+            if 'date' in dataframe.columns:
+                last_candle = dataframe['date'].iloc[-1]
+            elif isinstance(dataframe.index, pd.DatetimeIndex):
+                last_candle = dataframe.index[-1]
+            else:
+                return None
+            digest = hashlib.blake2b(
+                dataframe[['open', 'high', 'low', 'close', 'volume']].to_numpy().tobytes(),
+                digest_size=16
+            ).hexdigest()
+            engine = self.analysis_engine
+            settings = f"{engine.min_data_points},{engine.min_data_quality},{engine.min_mean_volume}"
+            return (f"{pair}|{self.timeframe}|{pd.Timestamp(last_candle).value}|{len(dataframe)}|"
+                    f"{engine.version}|{settings}|{digest}")
+        except Exception as e:
+            logger.debug(f"No cache key for {pair}: {str(e)}")
+            return None
+
+    @contextmanager
+    def _result_cache_lock(self, exclusive: bool):
+        """Hold a lock on the results cache, so concurrent runs don't corrupt it"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.RESULT_CACHE_PATH.with_name('analysis_results.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def _load_result_cache(self) -> Dict[str, Dict[str, float]]:
+        """Load the results cached by earlier runs"""
+        try:
+            with self._result_cache_lock(exclusive=False), \
+                    shelve.open(str(self.RESULT_CACHE_PATH), flag='r') as shelf:
+                # Entries are (last used timestamp, result)
+                return {key: entry[1] for key, entry in shelf.items() if isinstance(entry, tuple)}
+        except Exception as e:
+            logger.debug(f"No usable results cache: {str(e)}")
+            return {}
+
+    def _save_result_cache(self, entries: Dict[str, Dict[str, float]]) -> None:
+        """
+        Merge the entries used in this run into the results cache
+
+        Entries of other pairs, quote currencies and timeframes are kept until
+        they go unused for RESULT_CACHE_MAX_AGE or were made by another engine version.
+        """
+        try:
+            os.makedirs(self.RESULT_CACHE_PATH.parent, exist_ok=True)
+            now = time.time()
+            cutoff = now - self.RESULT_CACHE_MAX_AGE
+            engine_version = self.analysis_engine.version
+            with self._result_cache_lock(exclusive=True), \
+                    shelve.open(str(self.RESULT_CACHE_PATH), flag='c') as shelf:
+                shelf.update({key: (now, result) for key, result in entries.items()})
+                stale = [
+                    key for key, entry in shelf.items()
+                    if not isinstance(entry, tuple) or entry[0] < cutoff
+                    or key.split('|')[4:5] != [engine_version]
+                ]
+                for key in stale:
+                    del shelf[key]
+        except Exception as e:
+            logger.warning(f"Could not save results cache: {str(e)}")
+
+    def _finalize_result(self, result: Optional[Dict[str, float]], pair: str) -> Optional[Dict[str, float]]:
+        """Attach analyzer metadata to an analysis result"""
+        if result:
+            result['processing_time'] = time.time() - self.start_time
+            result['analyzer_version'] = self._version
+            logger.debug(f"Analysis completed for {pair}")
+        return result
+
+    def analyze_pair(self, pair: str) -> Optional[Dict[str, float]]:
+        """Execute full analysis for a single pair"""
+        try:
+            dataframe = self._fetch_pair_data(pair)
+            if dataframe is None:
+                return None
                 
             result = self.analysis_engine.analyze_dataframe(dataframe, pair)
-            if result:
-                result['processing_time'] = time.time() - self.start_time
-                result['analyzer_version'] = self._version
-                logger.debug(f"Analysis completed for {pair}")
-            return result
+            return self._finalize_result(result, pair)
             
         except Exception as e:
             logger.error(f"Analysis failed for {pair}: {str(e)}")
             return None
 
+    @staticmethod
+    def _time_left(deadline: Optional[float]) -> Optional[float]:
+        """Seconds until a time.monotonic() deadline (None without a deadline)"""
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    @staticmethod
+    def _terminate_process_pool(executor: ProcessPoolExecutor) -> None:
+        """Shut a process pool down without waiting, killing its running workers"""
+        # shutdown() drops the executor's process table, so take it first
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
     def run_analysis(self) -> Tuple[List[Dict[str, float]], List[str]]:
         """Execute parallel analysis across all pairs"""
         pairs = self._get_valid_pairs()
@@ -170,44 +427,139 @@ class VersionedAnalyzer:
             
         logger.info(f"Starting analysis of {len(pairs)} {self.quote_currency} pairs")
         
+        # Fetch data for all pairs that have none yet in one download run
+        self.data_manager.download_missing_pairs(pairs, self.days_to_analyze + self.extra_days)
+        
         results = []
         failed_pairs = []
+        # Results of pairs whose candles did not change since they were cached
+        # are reused; entries used in this run are written back
+        result_cache = self._load_result_cache()
+        fresh_cache = {}
+        cache_keys = {}
+        # Group pairs per process task, but keep enough tasks to use every worker
+        batch_size = max(1, min(self.ANALYSIS_BATCH_SIZE, len(pairs) // self.max_workers))
         
-        # Use ThreadPoolExecutor for parallel processing
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_pair = {executor.submit(self.analyze_pair, pair): pair for pair in pairs}
+        # The time budget covers loading and analyzing the pairs; the batch
+        # download above has already finished
+        deadline = time.monotonic() + self.analysis_timeout if self.analysis_timeout else None
+        timed_out = []
+        
+        # Data loading is I/O bound (files, downloads) and runs on threads, while
+        # the indicator math is CPU bound and runs in worker processes, which
+        # load the Numba kernels while the first pairs are still being read.
+        # The pools are shut down by hand so a run over budget doesn't wait for them.
+        io_executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        cpu_executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_worker_context,
+                                           initializer=warmup_kernels)
+        try:
+            # Load all pairs; _fetch_pair_data handles its own errors, so map
+            # can stream the dataframes back in order without per-pair futures
+            loaded = io_executor.map(self._fetch_pair_data, pairs, timeout=self._time_left(deadline))
             
-            # Collect results as they complete
-            for future in as_completed(future_to_pair):
-                pair = future_to_pair[future]
-                try:
-                    result = future.result(timeout=120)  # 2 minute timeout per pair
-                    if result:
-                        results.append(result)
-                        logger.info(f"✓ {pair} - Score: {result.get('composite_score', 0):.3f}")
-                    else:
+            # Hand loaded dataframes to the process pool in batches
+            future_to_batch = {}
+            pending = {}
+            loaded_count = 0
+            try:
+                for pair, dataframe in zip(pairs, loaded):
+                    loaded_count += 1
+                    if dataframe is None:
                         failed_pairs.append(pair)
                         logger.warning(f"✗ {pair} - Analysis failed")
-                except Exception as e:
-                    failed_pairs.append(pair)
-                    logger.error(f"✗ {pair} - Exception: {str(e)}")
+                        continue
+                        
+                    cache_key = self._result_cache_key(pair, dataframe)
+                    cached = result_cache.get(cache_key) if cache_key else None
+                    if cached is not None:
+                        fresh_cache[cache_key] = cached
+                        results.append(self._finalize_result(dict(cached), pair))
+                        continue
+                    if cache_key:
+                        cache_keys[pair] = cache_key
+                        
+                    pending[pair] = dataframe
+                    if len(pending) >= batch_size:
+                        future_to_batch[cpu_executor.submit(self.analysis_engine.batch_analyze, pending)] = list(pending)
+                        pending = {}
+            except TimeoutError:
+                # Out of time while loading: the rest of the pairs are dropped
+                timed_out.extend(list(pending) + pairs[loaded_count:])
+                pending = {}
+            if pending:
+                future_to_batch[cpu_executor.submit(self.analysis_engine.batch_analyze, pending)] = list(pending)
+            if results:
+                logger.info(f"Reusing cached results for {len(results)} unchanged pairs")
+            
+            # Collect results as they complete; per-pair successes are only
+            # logged at DEBUG, with a progress summary every PROGRESS_LOG_INTERVAL pairs
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            processed = 0
+            remaining_futures = set(future_to_batch)
+            while remaining_futures:
+                done, remaining_futures = wait(remaining_futures, timeout=self._time_left(deadline),
+                                               return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    batch = future_to_batch[future]
+                    try:
+                        batch_results = future.result()
+                    except Exception as e:
+                        failed_pairs.extend(batch)
+                        logger.error(f"✗ {', '.join(batch)} - Exception: {str(e)}")
+                        continue
+                        
+                    for pair in batch:
+                        result = batch_results.get(pair)
+                        if result and pair in cache_keys:
+                            fresh_cache[cache_keys[pair]] = dict(result)
+                        result = self._finalize_result(result, pair)
+                        if result:
+                            results.append(result)
+                            if debug_enabled:
+                                logger.debug(f"✓ {pair} analyzed")
+                        else:
+                            failed_pairs.append(pair)
+                            logger.warning(f"✗ {pair} - Analysis failed")
+                            
+                        processed += 1
+                        if processed % self.PROGRESS_LOG_INTERVAL == 0:
+                            logger.info(f"Analyzed {processed}/{len(pairs)} pairs")
+                
+                if remaining_futures and deadline is not None and time.monotonic() >= deadline:
+                    # Out of time: drop the batches still queued or running
+                    timed_out.extend(pair for future in remaining_futures for pair in future_to_batch[future])
+                    break
+        finally:
+            if timed_out:
+                # Don't wait for loads or analyses still running
+                io_executor.shutdown(wait=False, cancel_futures=True)
+                self._terminate_process_pool(cpu_executor)
+            else:
+                io_executor.shutdown()
+                cpu_executor.shutdown()
+        
+        if timed_out:
+            failed_pairs.extend(timed_out)
+            logger.warning(f"Analysis time budget of {self.analysis_timeout}s exceeded, {len(timed_out)} pairs not analyzed")
+        
+        self._save_result_cache(fresh_cache)
         
         # Calculate composite scores if we have results
         if results:
             logger.info("Calculating composite scores...")
-            for res in results:
-                # Weighted composite score calculation
-                res['composite_score'] = (
-                    0.3 * min(res.get('trend_strength', 0), 100) / 100 +
-                    0.25 * min(res.get('volatility', 0), 5) / 5 +
-                    0.2 * min(res.get('volume_score', 0), 20) / 20 +
-                    0.15 * min(res.get('coral_score', 0), 1) +
-                    0.1 * min(res.get('stc_score', 0), 100) / 100
-                )
+            keys, weights, caps = zip(*self.SCORE_COMPONENTS)
+            caps = np.array(caps, dtype=np.float64)
+            metrics = np.array([[res.get(key, 0) for key in keys] for res in results], dtype=np.float64)
+            
+            # Weighted composite score of the capped, normalized metrics
+            scores = (np.minimum(metrics, caps) / caps) @ np.array(weights)
             
-            # Sort by composite score
-            results.sort(key=lambda x: x['composite_score'], reverse=True)
+            # Sort by composite score (stable, highest first)
+            order = np.argsort(-scores, kind='stable')
+            results = [results[i] for i in order]
+            for res, score in zip(results, scores[order]):
+                res['composite_score'] = float(score)
         
         elapsed = (time.time() - self.start_time) / 60
         logger.info(f"Analysis completed in {elapsed:.1f} minutes")
@@ -249,6 +601,7 @@ class VersionedAnalyzer:
                     'parameters': {
                         'max_workers': self.max_workers,
                         'min_data_points': self.min_data_points,
+                        'min_mean_volume': self.min_mean_volume,
                         'extra_days': self.extra_days
                     }
                 },
@@ -258,11 +611,20 @@ class VersionedAnalyzer:
                 'summary_statistics': self._calculate_summary_stats(results) if results else {}
             }
             
-            # Save to both directories
+            # Serialize once, compact (indentation adds ~40% to the results
+            # list), then save to both directories
+            if orjson is not None:
+                payload = orjson.dumps(
+                    report,
+                    option=orjson.OPT_SERIALIZE_NUMPY,
+                    default=str
+                )
+            else:
+                payload = json.dumps(report, separators=(',', ':'), default=str).encode('utf-8')
+            
             for output_dir in output_dirs:
                 filepath = output_dir / filename
-                with open(filepath, 'w') as f:
-                    json.dump(report, f, indent=2, default=str)
+                filepath.write_bytes(payload)
                 logger.info(f"Results saved to {filepath}")
             
             return report
@@ -308,6 +670,23 @@ class VersionedAnalyzer:
             logger.warning(f"Error calculating summary stats: {str(e)}")
             return {}
 
+    def close(self) -> None:
+        """
+        Release this analyzer's exchange connection
+
+        The connection is shared with other analyzers using the same config;
+        it is closed once the last of them is closed.
+        """
+        if self.exchange is not None:
+            _release_shared_exchange(self.exchange)
+            self.exchange = None
+
+    def __enter__(self) -> 'VersionedAnalyzer':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     @property
     def version(self) -> str:
         """Get current analyzer version"""
@@ -1,13 +1,21 @@
 """
 Data Manager - Versioned Implementation
 Version History:
+• v1.7.4 - JSON data left from before a format switch converted instead of downloaded again
+• v1.7.3 - Pairs with short history are not downloaded again in the same session
+• v1.7.2 - Per-pair load attempts logged at DEBUG
+• v1.7.1 - Loaded OHLCV columns downcast to float32
+• v1.7.0 - OHLCV storage format taken from config (json, jsongz, feather, parquet)
+• v1.6.5 - Batch download of missing pairs, dropped fixed post-download sleeps
+• v1.6.4 - Download verification peeks at the file instead of parsing it
 • v1.6.3 - Fixed filename format handling (both _ and -)
 • v1.6.2 - Enhanced download verification
 """
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+import numpy as np
 import pandas as pd
 import logging
 from freqtrade.data.history import load_pair_history
@@ -18,7 +26,15 @@ import os
 logger = logging.getLogger(__name__)
 
 class DataManager:
-    CURRENT_VERSION = "1.6.3"
+    CURRENT_VERSION = "1.7.4"
+    
+    # File extension freqtrade uses for each OHLCV data format
+    DATA_FORMAT_EXTENSIONS = {
+        'json': 'json',
+        'jsongz': 'json.gz',
+        'feather': 'feather',
+        'parquet': 'parquet'
+    }
     
     def __init__(self, config: Dict, exchange, timeframe: str = '1d', max_retries: int = 3):
         self._version = self.CURRENT_VERSION
@@ -26,8 +42,16 @@ class DataManager:
         self.timeframe = timeframe
         self.max_retries = max_retries
         self.datadir = Path(config['datadir'])
+        self.data_format = config.get('dataformat', 'json')
+        if self.data_format not in self.DATA_FORMAT_EXTENSIONS:
+            logger.warning(f"Unsupported data format '{self.data_format}', using json")
+            self.data_format = 'json'
+        # Pairs downloaded in this session; fetching them again cannot add history
+        self._downloaded_pairs = set()
+        # Whether leftover JSON data was already looked for (and converted)
+        self._json_checked = False
         self._ensure_data_directory()
-        logger.info(f"Initialized DataManager v{self._version}")
+        logger.info(f"Initialized DataManager v{self._version} ({self.data_format} data)")
 
     def _ensure_data_directory(self):
         """Ensure data directory exists with proper permissions"""
@@ -40,13 +64,14 @@ class DataManager:
             logger.error(f"Data directory {self.datadir} not accessible: {str(e)}")
             raise
 
-    def _get_data_filenames(self, pair: str) -> list:
-        """Return all possible filename variations for a pair"""
+    def _get_data_filenames(self, pair: str, data_format: Optional[str] = None) -> list:
+        """Return all possible filename variations for a pair (configured format by default)"""
         pair_safe1 = pair.replace('/', '_')  # ADA_BTC
         pair_safe2 = pair.replace('/', '-')  # ADA-BTC
+        extension = self.DATA_FORMAT_EXTENSIONS[data_format or self.data_format]
         return [
-            self.datadir / f"{pair_safe1}-{self.timeframe}.json",
-            self.datadir / f"{pair_safe2}-{self.timeframe}.json"
+            self.datadir / f"{pair_safe1}-{self.timeframe}.{extension}",
+            self.datadir / f"{pair_safe2}-{self.timeframe}.{extension}"
         ]
 
     def _find_data_file(self, pair: str) -> Optional[Path]:
@@ -67,41 +92,118 @@ class DataManager:
             if os.path.getsize(datafile) < 100:  # Minimum expected file size
                 return False
                 
-            # Check file content
-            with open(datafile) as f:
-                data = json.load(f)
-                if not isinstance(data, list) or len(data) < 1:
-                    return False
-                    
-            return True
+            # Check the file is complete without parsing it; the caller loads
+            # (and fully parses) it right after
+            with open(datafile, 'rb') as f:
+                head = f.read(64)
+                f.seek(-64, os.SEEK_END)
+                tail = f.read()
+                
+            if self.data_format == 'json':
+                # A non-empty list of candles
+                head, tail = head.lstrip(), tail.rstrip()
+                return head.startswith(b'[') and head[1:].lstrip().startswith(b'[') and tail.endswith(b']')
+            if self.data_format == 'parquet':
+                return head.startswith(b'PAR1') and tail.endswith(b'PAR1')
+            if self.data_format == 'feather':
+                return head.startswith(b'ARROW1') and tail.endswith(b'ARROW1')
+            # jsongz: gzip magic number
+            return head.startswith(b'\x1f\x8b')
         except Exception:
             return False
 
-    def _download_with_freqtrade(self, pair: str, days: int) -> bool:
-        """Use Freqtrade's built-in downloader"""
+    def _download_command(self, pairs: List[str], days: int) -> List[str]:
+        """Build the freqtrade download-data command for one or more pairs"""
+        return [sys.executable, '-m', 'freqtrade'] + [
+            "download-data",
+            "--pairs", *pairs,
+            "--timeframe", self.timeframe,
+            "--days", str(days),
+            "--datadir", str(self.datadir),
+            "--exchange", self.config['exchange']['name'],
+            "--data-format-ohlcv", self.data_format,
+            "--trading-mode", "spot"
+        ]
+
+    def download_missing_pairs(self, pairs: List[str], days: int) -> List[str]:
+        """
+        Download data for every pair without a local data file in a single
+        freqtrade call, instead of one subprocess per pair
+        
+        Returns:
+            Pairs that still have no valid data file afterwards
+        """
+        missing = [pair for pair in pairs if not self._find_data_file(pair)]
+        if missing and self._has_json_data(missing) and self.convert_data_format('json'):
+            # History stored before switching formats; convert it instead of downloading
+            missing = [pair for pair in missing if not self._find_data_file(pair)]
+        if not missing:
+            return []
+            
+        try:
+            logger.info(f"Downloading data for {len(missing)} pairs in one batch...")
+            subprocess.run(self._download_command(missing, days), check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Batch download failed: {e.stderr}")
+        except Exception as e:
+            logger.error(f"Unexpected batch download error: {str(e)}")
+            
+        still_missing = [pair for pair in missing if not self._verify_downloaded_file(pair)]
+        self._downloaded_pairs.update(set(missing).difference(still_missing))
+        logger.info(f"Batch download complete: {len(missing) - len(still_missing)}/{len(missing)} pairs downloaded")
+        return still_missing
+
+    def _has_json_data(self, pairs: List[str]) -> bool:
+        """Check for JSON files of pairs missing in the configured format (checked once per session)"""
+        if self.data_format == 'json' or self._json_checked:
+            return False
+        self._json_checked = True
+        return any(
+            filename.exists()
+            for pair in pairs
+            for filename in self._get_data_filenames(pair, 'json')
+        )
+
+    def convert_data_format(self, format_from: str = 'json') -> bool:
+        """
+        Convert existing OHLCV data files to the configured format with
+        freqtrade convert-data, so stored history isn't downloaded again
+        after switching formats
+        """
+        if format_from == self.data_format:
+            return True
+            
         try:
-            cmd = [sys.executable, '-m', 'freqtrade'] + [
-                "download-data",
-                "--pairs", pair,
-                "--timeframe", self.timeframe,
-                "--days", str(days),
+            logger.info(f"Converting {format_from} data in {self.datadir} to {self.data_format}...")
+            subprocess.run([sys.executable, '-m', 'freqtrade'] + [
+                "convert-data",
+                "--format-from", format_from,
+                "--format-to", self.data_format,
+                "--timeframes", self.timeframe,
                 "--datadir", str(self.datadir),
                 "--exchange", self.config['exchange']['name'],
-                "--data-format-ohlcv", "json",
                 "--trading-mode", "spot"
-            ]
-            
+            ], check=True, capture_output=True, text=True)
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Data conversion failed: {e.stderr}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected data conversion error: {str(e)}")
+            return False
+
+    def _download_with_freqtrade(self, pair: str, days: int) -> bool:
+        """Use Freqtrade's built-in downloader"""
+        try:
             logger.info(f"Downloading {pair} data...")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            
-            # Add delay to allow filesystem to sync
-            time.sleep(1)
+            subprocess.run(self._download_command([pair], days), check=True, capture_output=True, text=True)
             
             # Verify the download was actually successful
             if not self._verify_downloaded_file(pair):
                 logger.warning(f"Download verification failed for {pair}")
                 return False
                 
+            self._downloaded_pairs.add(pair)
             logger.debug(f"Download successful for {pair}")
             return True
             
@@ -112,6 +214,17 @@ class DataManager:
             logger.error(f"Unexpected download error for {pair}: {str(e)}")
             return False
 
+    @staticmethod
+    def _downcast_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Store OHLCV columns as float32: the indicators don't need double
+        precision, and it halves the memory scanned and the bytes pickled
+        to the analysis worker processes
+        """
+        columns = [col for col in ('open', 'high', 'low', 'close', 'volume') if col in df.columns]
+        df[columns] = df[columns].astype(np.float32)
+        return df
+
     def _load_data_safely(self, pair: str) -> Optional[pd.DataFrame]:
         """Safe wrapper around data loading"""
         datafile = self._find_data_file(pair)
@@ -125,13 +238,16 @@ class DataManager:
                     datadir=self.datadir,
                     pair=pair,
                     timeframe=self.timeframe,
-                    data_format="json"
+                    data_format=self.data_format
                 )
                 if df is not None and not df.empty:
-                    return df
+                    return self._downcast_ohlcv(df)
             except Exception as e:
                 logger.debug(f"Standard load failed, trying direct load: {str(e)}")
 
+            if self.data_format != 'json':
+                return None
+                
             # Fallback to direct JSON loading
             with open(datafile) as f:
                 data = json.load(f)
@@ -140,7 +256,7 @@ class DataManager:
                 df = pd.DataFrame(data, columns=['date', 'open', 'high', 'low', 'close', 'volume'])
                 df['date'] = pd.to_datetime(df['date'], unit='ms')
                 df.set_index('date', inplace=True)
-                return df
+                return self._downcast_ohlcv(df)
                 
             return None
             
@@ -151,17 +267,19 @@ class DataManager:
     def ensure_pair_data(self, pair: str, days: int) -> Optional[pd.DataFrame]:
         """Ensure data exists with robust retry logic"""
         for attempt in range(1, self.max_retries + 1):
-            logger.info(f"Processing {pair} (attempt {attempt}/{self.max_retries})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Processing {pair} (attempt {attempt}/{self.max_retries})")
             
             try:
                 # Try loading existing data first
                 df = self._load_data_safely(pair)
-                if df is not None and len(df) >= days:
+                # A pair that is still short right after its download is a young
+                # listing; downloading it again would only repeat the subprocess
+                if df is not None and (len(df) >= days or pair in self._downloaded_pairs):
                     return df
                     
                 # Download if needed
                 if self._download_with_freqtrade(pair, days):
-                    time.sleep(2)  # Allow time for file system sync
                     df = self._load_data_safely(pair)
                     if df is not None:
                         return df
@@ -12,8 +12,11 @@ import json
 import logging
 from pathlib import Path
 from typing import List, Dict, Set, Optional, Union
+from collections import Counter
 import re
 
+from .config_handler import load_json_file
+
 logger = logging.getLogger(__name__)
 
 class PairlistHandler:
@@ -24,6 +27,9 @@ class PairlistHandler:
     def __init__(self, user_data_dir: Path = None):
         self.user_data_dir = user_data_dir or Path("/home/facepipe/freqtrade/user_data")
         self.config_cache = {}
+        # Quote currency -> pairlists per config, so the config files are only
+        # scanned once per handler
+        self.pairlist_cache = {}
         logger.info(f"PairlistHandler initialized with user_data_dir: {self.user_data_dir}")
     
     def find_config_files(self) -> List[Path]:
@@ -57,8 +63,7 @@ class PairlistHandler:
     def load_config_file(self, config_path: Path) -> Optional[Dict]:
         """Load and parse a single config file"""
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            config = load_json_file(config_path)
             
             # Cache the config
             self.config_cache[str(config_path)] = config
@@ -137,9 +142,18 @@ class PairlistHandler:
         """
         Load pairlists from all config files
         
+        Listing, combining and overlap analysis all start here; the configs
+        are scanned on the first call and later calls get copies of the result.
+        
         Returns:
             Dict with config names as keys and pair lists as values
         """
+        if quote_currency not in self.pairlist_cache:
+            self.pairlist_cache[quote_currency] = self._scan_pairlists(quote_currency)
+        return {name: list(pairs) for name, pairs in self.pairlist_cache[quote_currency].items()}
+    
+    def _scan_pairlists(self, quote_currency: str = None) -> Dict[str, List[str]]:
+        """Find and parse all config files and extract their pairlists"""
         all_pairlists = {}
         config_files = self.find_config_files()
         
@@ -181,15 +195,15 @@ class PairlistHandler:
             Sorted list of unique pairs
         """
         all_pairlists = self.load_all_pairlists(quote_currency)
-        exclude_configs = exclude_configs or []
+        exclude_configs = set(exclude_configs or ())
         
-        combined_pairs = set()
-        
-        for config_name, pairs in all_pairlists.items():
-            if config_name not in exclude_configs:
-                combined_pairs.update(pairs)
+        # Union of the remaining configs in one C-level set operation
+        combined_pairs = set().union(*(
+            pairs for config_name, pairs in all_pairlists.items()
+            if config_name not in exclude_configs
+        ))
         
-        result = sorted(list(combined_pairs))
+        result = sorted(combined_pairs)
         logger.info(f"Combined pairlist contains {len(result)} unique pairs")
         return result
     
@@ -246,22 +260,26 @@ class PairlistHandler:
         if len(all_pairlists) < 2:
             return {"message": "Need at least 2 configs to analyze overlap"}
         
-        # Find common pairs across all configs
-        config_names = list(all_pairlists.keys())
-        common_pairs = set(all_pairlists[config_names[0]])
-        
-        for config_name in config_names[1:]:
-            common_pairs &= set(all_pairlists[config_name])
-        
-        # Find unique pairs for each config
-        unique_pairs = {}
-        for config_name, pairs in all_pairlists.items():
-            others_pairs = set()
-            for other_name, other_pairs in all_pairlists.items():
-                if other_name != config_name:
-                    others_pairs.update(other_pairs)
-            
-            unique_pairs[config_name] = list(set(pairs) - others_pairs)
+        # Each config's pairs without repeats, in listed order
+        distinct_pairs = {name: list(dict.fromkeys(pairs)) for name, pairs in all_pairlists.items()}
+        pair_sets = {name: set(pairs) for name, pairs in distinct_pairs.items()}
+        
+        # Find common pairs across all configs, intersecting the smallest
+        # pairlists first and stopping once nothing is left in common
+        by_size = sorted(pair_sets.values(), key=len)
+        common_pairs = set(by_size[0])
+        for pairs in by_size[1:]:
+            if not common_pairs:
+                break
+            common_pairs &= pairs
+        
+        # Find unique pairs for each config: pairs listed by exactly one config,
+        # counted once instead of rebuilding the union of the others per config
+        occurrences = Counter(pair for pairs in distinct_pairs.values() for pair in pairs)
+        unique_pairs = {
+            config_name: [pair for pair in pairs if occurrences[pair] == 1]
+            for config_name, pairs in distinct_pairs.items()
+        }
         
         analysis = {
             "total_configs": len(all_pairlists),